@@ -1,16 +1,27 @@
 """API routes for YTSumAI"""
 
+import json
+from typing import Any, Iterator
 from fastapi import APIRouter, HTTPException
-from app.models.schemas import SummarizeRequest, SummarizeResponse, VideoMetadata
-from app.services import YouTubeDownloader, AudioTranscriber, TextSummarizer
-import time
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.models.schemas import SummarizeRequest, SummarizeResponse, VideoMetadata, JobResponse, BatchRequest
+from app.services import YouTubeDownloader, AudioTranscriber, TextSummarizer, model_registry
+from app.services.batch import BatchRunner
+from app.services.jobs import JobManager
+from app.services.ollama_client import async_ollama_client
+from app.services.pipeline import SummarizationPipeline
+from app.services.scheduler import BacklogFullError
 
 router = APIRouter()
 
-# Initialize services
+# Initialize services (the Whisper model itself is shared via model_registry)
 downloader = YouTubeDownloader()
 transcriber = AudioTranscriber()
 summarizer = TextSummarizer()
+pipeline = SummarizationPipeline(downloader, transcriber, summarizer)
+job_manager = JobManager(pipeline)
+batch_runner = BatchRunner(downloader, transcriber, summarizer)
 
 
 @router.get("/health")
@@ -27,12 +38,18 @@ async def health_check():
 async def check_models():
     """Check availability of required models"""
     stt_available = transcriber.verify_model_available()
-    sum_available = summarizer.verify_model_available()
+    try:
+        # Async client: the event loop isn't blocked while Ollama answers
+        sum_available = await async_ollama_client.has_model(summarizer.model)
+    except Exception as e:
+        print(f"Failed to verify model availability: {str(e)}")
+        sum_available = False
     
     return {
         "stt_model": {
-            "name": "OpenAI Whisper (offline)",
-            "available": stt_available
+            "name": f"OpenAI Whisper {transcriber.model_size} (offline)",
+            "available": stt_available,
+            "loaded": model_registry.is_loaded(transcriber.model_size, transcriber.device)
         },
         "summarization_model": {
             "name": summarizer.model,
@@ -48,42 +65,142 @@ async def summarize_video(request: SummarizeRequest):
     
     This endpoint:
     1. Downloads audio from the YouTube URL
-    2. Transcribes the audio using OpenAI Whisper (offline)
-    3. Summarizes the transcript using Ollama LLM
-    4. Returns the transcript and summary
+    2. Transcribes the audio using OpenAI Whisper (offline), starting while
+       the download is still in progress
+    3. Summarizes the transcript using Ollama LLM (or, with mode="extractive",
+       picks its key sentences without an LLM call)
+    4. Returns the transcript (with timestamped segments) and summary
     
-    Note: Audio files are kept for verification and cleaned up on next request
+    Note: Audio files are kept in a disk-budgeted cache (AUDIO_CACHE_MAX_MB)
     """
     try:
-        start_time = time.time()
-        
-        # Download audio
-        audio_file, metadata = downloader.download_audio(str(request.url))
-        
-        # Transcribe audio
-        transcript = transcriber.transcribe_audio(audio_file)
-        
-        # Summarize transcript
-        summary = summarizer.summarize(transcript)
-        
-        # Note: Audio file kept for verification (cleaned up on next download)
-        
-        processing_time = time.time() - start_time
-        
-        # Calculate word counts
-        transcript_word_count = len(transcript.split())
-        summary_word_count = len(summary.split())
-        
-        return SummarizeResponse(
-            metadata=metadata,
-            transcript=transcript,
-            summary=summary,
-            processing_time=processing_time,
-            transcript_word_count=transcript_word_count,
-            summary_word_count=summary_word_count
-        )
+        # Download and transcription overlap; audio stays in the disk-budgeted
+        # cache for repeat requests. The blocking pipeline runs in the
+        # threadpool so the event loop keeps serving other requests.
+        return await run_in_threadpool(pipeline.run, str(request.url), mode=request.mode)
         
+    except BacklogFullError as e:
+        raise _busy(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
+
+def _busy(error: BacklogFullError) -> HTTPException:
+    """503 telling the client when to retry"""
+    return HTTPException(
+        status_code=503, detail=str(error), headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _summarize_events(url: str, mode: str) -> Iterator[str]:
+    """Run the pipeline and translate its events to SSE messages"""
+    try:
+        for event, data in pipeline.stream(url, mode=mode):
+            if event == "queued":
+                yield _sse("queued", {"estimated_wait": data})
+            elif event == "progress":
+                yield _sse("progress", {"progress": data[0], "message": data[1]})
+            elif event == "metadata":
+                yield _sse("metadata", data.model_dump())
+            elif event == "transcript":
+                transcript, segments = data
+                yield _sse("transcript", {
+                    "transcript": transcript,
+                    "segments": [seg.model_dump() for seg in segments]
+                })
+            elif event == "token":
+                yield _sse("token", {"text": data})
+            elif event == "result":
+                yield _sse("done", data.model_dump(mode="json"))
+    except BacklogFullError as e:
+        yield _sse("error", {"status_code": 503, "detail": str(e), "retry_after": e.retry_after})
+    except ValueError as e:
+        yield _sse("error", {"status_code": 400, "detail": str(e)})
+    except Exception as e:
+        yield _sse("error", {"status_code": 500, "detail": f"Processing failed: {str(e)}"})
+
+
+@router.post("/summarize/stream")
+async def summarize_video_stream(request: SummarizeRequest):
+    """
+    Summarize a YouTube video, streaming progress and summary tokens
+    
+    Returns a text/event-stream with these events:
+    - queued: {"estimated_wait"} seconds, if the video waits for a worker
+    - progress: {"progress", "message"} stage updates
+    - metadata: video metadata, once the audio is opened
+    - transcript: {"transcript", "segments"}, once transcription is done
+    - token: {"text"} next piece of the summary, as the LLM generates it
+    - done: the full SummarizeResponse
+    - error: {"status_code", "detail"} if processing failed (503 errors
+      also carry "retry_after" seconds)
+    """
+    # The sync generator runs in the threadpool; disconnecting clients stop it
+    return StreamingResponse(
+        _summarize_events(str(request.url), request.mode),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(request: SummarizeRequest):
+    """
+    Queue a YouTube video for summarization and return immediately
+    
+    Poll GET /api/jobs/{job_id} for per-stage progress and the result.
+    Jobs run JOB_WORKERS at a time, shortest video first; when the estimated
+    backlog is over SCHEDULER_MAX_BACKLOG_MINUTES the request is refused
+    with 503 and a Retry-After header.
+    """
+    try:
+        # Admission needs the video's duration (a metadata lookup)
+        return await run_in_threadpool(job_manager.submit, str(request.url), request.mode)
+    except BacklogFullError as e:
+        raise _busy(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get the status, progress and (once completed) result of a job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.post("/batch")
+async def summarize_batch(request: BatchRequest):
+    """
+    Summarize many videos, playlists or channels, streaming results as NDJSON
+    
+    Playlists and channels are expanded to their videos (up to BATCH_MAX_VIDEOS
+    each). Downloads, transcription and summarization run as a pipeline with
+    their own worker counts (BATCH_DOWNLOAD_WORKERS, BATCH_STT_WORKERS,
+    BATCH_LLM_WORKERS). Each line of the response is one BatchItemResult,
+    written as soon as that video finishes (or fails).
+    """
+    try:
+        batch_runner.check_admission()
+    except BacklogFullError as e:
+        raise _busy(e)
+    try:
+        urls = await run_in_threadpool(batch_runner.expand, [str(url) for url in request.urls])
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not expand URLs: {str(e)}")
+    if not urls:
+        raise HTTPException(status_code=400, detail="No videos found")
+    
+    lines = (item.model_dump_json() + "\n" for item in batch_runner.run(urls, request.mode))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
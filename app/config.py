@@ -10,22 +10,86 @@ load_dotenv()
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 DOWNLOAD_DIR = BASE_DIR / os.getenv("DOWNLOAD_DIR", "downloads")
+CACHE_DIR = BASE_DIR / os.getenv("CACHE_DIR", "cache")
 
 # Ensure directories exist
 DOWNLOAD_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # Ollama configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "llama3.1:8b-instruct-q4_K_M")
+# Concurrent generate requests per process; match the server's OLLAMA_NUM_PARALLEL
+OLLAMA_MAX_PARALLEL = max(1, int(os.getenv("OLLAMA_MAX_PARALLEL", "4")))
+# How long Ollama keeps the model loaded after our last request (empty = server default)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_TAGS_TTL_SECONDS = float(os.getenv("OLLAMA_TAGS_TTL_SECONDS", "30"))  # model list cache
+
+# Whisper (speech-to-text) settings
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")  # tiny, base, small, medium, large
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "")  # empty = auto-detect (cuda if available)
+WHISPER_DTYPE = os.getenv("WHISPER_DTYPE", "float32")  # float16 only applies on GPU
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "false").lower() in ("1", "true", "yes")
 
 # Processing limits
 MAX_VIDEO_DURATION = int(os.getenv("MAX_VIDEO_DURATION", "7200"))  # 2 hours
+
+# Background jobs (/api/jobs)
+JOB_WORKERS = max(1, int(os.getenv("JOB_WORKERS", "1")))  # videos processed at once
+JOB_MAX_WAITING = max(1, int(os.getenv("JOB_MAX_WAITING", "32")))  # jobs queued or running at once
+JOB_RETENTION_MINUTES = int(os.getenv("JOB_RETENTION_MINUTES", "60"))  # keep finished jobs this long
+
+# Scheduling: shortest estimated job first, with aging; cost = duration x
+# measured real-time factor (processing seconds per second of video)
+SCHEDULER_MAX_BACKLOG_MINUTES = float(os.getenv("SCHEDULER_MAX_BACKLOG_MINUTES", "120"))  # 0 = no limit
+SCHEDULER_AGING = float(os.getenv("SCHEDULER_AGING", "1.0"))  # cost seconds forgiven per second waited
+SCHEDULER_INITIAL_RTF = float(os.getenv("SCHEDULER_INITIAL_RTF", "0.5"))  # until runs are measured
+SCHEDULER_RTF_ALPHA = float(os.getenv("SCHEDULER_RTF_ALPHA", "0.2"))  # EWMA weight of the latest run
+
+# Batch/playlist processing (/api/batch, batch_cli.py): concurrency per stage
+BATCH_DOWNLOAD_WORKERS = max(1, int(os.getenv("BATCH_DOWNLOAD_WORKERS", "3")))
+BATCH_STT_WORKERS = max(1, int(os.getenv("BATCH_STT_WORKERS", "1")))
+BATCH_LLM_WORKERS = max(1, int(os.getenv("BATCH_LLM_WORKERS", "2")))
+BATCH_MAX_VIDEOS = int(os.getenv("BATCH_MAX_VIDEOS", "500"))  # per playlist/channel
+
 CHUNK_DURATION_MINUTES = int(os.getenv("CHUNK_DURATION_MINUTES", "30"))
 
+# Parallel transcription (1 worker = sequential, in-process)
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "1"))
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", "0"))  # 0 = split cores evenly
+PARALLEL_CHUNK_MINUTES = int(os.getenv("PARALLEL_CHUNK_MINUTES", "5"))
+
+# Voice-activity detection (skips silence and music before Whisper)
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() in ("1", "true", "yes")
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "12"))  # dB above the noise floor
+VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "300"))
+
 # Audio settings
-AUDIO_FORMAT = "mp3"
+# auto (16 kHz mono opus for Whisper), opus16k, pcm16k, native (as downloaded), mp3, wav
+AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", "auto").strip().lower()
 AUDIO_BITRATE = "128k"
+OPUS_BITRATE = os.getenv("OPUS_BITRATE", "24k")
+AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "2048"))  # disk budget for DOWNLOAD_DIR
+METADATA_CACHE_TTL_HOURS = float(os.getenv("METADATA_CACHE_TTL_HOURS", "24"))
+# Decode audio while it downloads so transcription overlaps the download
+STREAMING_DOWNLOAD = os.getenv("STREAMING_DOWNLOAD", "true").lower() in ("1", "true", "yes")
+STREAM_WINDOW_SECONDS = int(os.getenv("STREAM_WINDOW_SECONDS", "60"))  # Whisper window while streaming
+STREAM_BUFFER_MINUTES = int(os.getenv("STREAM_BUFFER_MINUTES", "60"))  # decoded audio read ahead (~115 MB/h)
+
+# Transcript cache (repeat requests for the same audio skip Whisper)
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "200"))
+
+# LLM response cache (identical prompts, e.g. retried jobs, skip Ollama)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "100"))
 
 # Summarization settings
 MAX_SUMMARY_LENGTH = 500  # words
-CHUNK_OVERLAP = 100  # words for overlap between chunks
+CHUNK_OVERLAP = 100  # tokens of overlap between chunks
+# Context window requested from Ollama; prompts and chunks are sized to fit it
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+# Shrink long transcripts to their most central sentences before the LLM sees
+# them (cuts prompt evaluation on CPU hosts). 0 tokens = fit one request.
+EXTRACTIVE_COMPRESSION = os.getenv("EXTRACTIVE_COMPRESSION", "false").lower() in ("1", "true", "yes")
+EXTRACTIVE_TARGET_TOKENS = int(os.getenv("EXTRACTIVE_TARGET_TOKENS", "0"))
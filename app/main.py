@@ -1,9 +1,13 @@
 """FastAPI application for YTSumAI"""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import router
-from app.config import SUMMARIZATION_MODEL
+from fastapi.concurrency import run_in_threadpool
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.api.routes import router, job_manager
+from app.config import SUMMARIZATION_MODEL, WHISPER_MODEL, WHISPER_PRELOAD
+from app.services.model_registry import model_registry
+from app.services.ollama_client import ollama_client, async_ollama_client
 
 # Create FastAPI app
 app = FastAPI(
@@ -33,30 +37,53 @@ async def root():
         "description": "Offline YouTube Video Summarizer",
         "version": "1.0.0",
         "models": {
-            "stt": "OpenAI Whisper (offline)",
+            "stt": f"OpenAI Whisper {WHISPER_MODEL} (offline)",
             "summarization": SUMMARIZATION_MODEL
         },
         "endpoints": {
             "health": "/api/health",
             "models": "/api/models",
-            "summarize": "/api/summarize (POST)"
+            "summarize": "/api/summarize (POST)",
+            "summarize_stream": "/api/summarize/stream (POST, Server-Sent Events)",
+            "jobs": "/api/jobs (POST), /api/jobs/{job_id} (GET)",
+            "batch": "/api/batch (POST, NDJSON)",
+            "metrics": "/metrics"
         }
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage timings, throughput, queue depth, cache hit counts"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Startup event to verify configuration"""
     print("=" * 60)
     print("YTSumAI - Offline YouTube Video Summarizer")
     print("=" * 60)
-    print(f"STT Model: OpenAI Whisper (offline)")
+    print(f"STT Model: OpenAI Whisper {WHISPER_MODEL} (offline)")
     print(f"Summarization Model: {SUMMARIZATION_MODEL}")
     print("=" * 60)
+    
+    # Pre-warm the shared Whisper model so the first request doesn't pay for loading
+    if WHISPER_PRELOAD:
+        await run_in_threadpool(model_registry.preload)
+
     print("API is ready!")
     print("=" * 60)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the job workers and scheduler, and close pooled Ollama connections"""
+    job_manager.shutdown()
+    ollama_client.close()
+    await async_ollama_client.aclose()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
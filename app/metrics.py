@@ -0,0 +1,115 @@
+"""Prometheus metrics for YTSumAI (served at /metrics)"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Seconds, from a short clip to a multi-hour lecture
+_STAGE_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+_RTF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4)
+_TOKEN_RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Download
+DOWNLOAD_SECONDS = Histogram(
+    "ytsumai_download_seconds",
+    "Audio download time per video (streams: time waiting on FFmpeg, excluding pauses for the transcriber)",
+    ["method"], buckets=_STAGE_BUCKETS
+)
+DOWNLOAD_FIRST_AUDIO_SECONDS = Histogram(
+    "ytsumai_download_first_audio_seconds", "Time from starting a streamed download to its first decoded window",
+    buckets=_STAGE_BUCKETS
+)
+DOWNLOAD_BYTES = Counter(
+    "ytsumai_download_bytes_total",
+    "Source audio bytes downloaded (streams: the selected format's size as reported by YouTube)",
+    ["method"]
+)
+AUDIO_CACHE_WRITTEN_BYTES = Counter(
+    "ytsumai_audio_cache_written_bytes_total", "Bytes of audio files written to the audio cache", ["method"]
+)
+
+# Decoding
+DECODE_SECONDS = Histogram(
+    "ytsumai_decode_seconds", "Time spent waiting on FFmpeg for decoded PCM, per cached file",
+    buckets=_STAGE_BUCKETS
+)
+
+# Transcription
+STT_SECONDS = Histogram(
+    "ytsumai_stt_seconds", "Whisper time per chunk", ["model"], buckets=_STAGE_BUCKETS
+)
+STT_AUDIO_SECONDS = Counter(
+    "ytsumai_stt_audio_seconds_total", "Seconds of audio (after VAD) passed to Whisper", ["model"]
+)
+STT_REAL_TIME_FACTOR = Histogram(
+    "ytsumai_stt_real_time_factor", "Whisper seconds per second of audio, per chunk", ["model"],
+    buckets=_RTF_BUCKETS
+)
+
+# Ollama
+LLM_REQUESTS = Counter("ytsumai_llm_requests_total", "Ollama generate calls", ["model"])
+LLM_TOKENS = Counter("ytsumai_llm_tokens_total", "Ollama tokens processed", ["model", "kind"])
+LLM_PROMPT_TOKENS_PER_SECOND = Histogram(
+    "ytsumai_llm_prompt_eval_tokens_per_second", "Ollama prompt evaluation speed", ["model"],
+    buckets=_TOKEN_RATE_BUCKETS
+)
+LLM_GENERATION_TOKENS_PER_SECOND = Histogram(
+    "ytsumai_llm_generation_tokens_per_second", "Ollama generation speed", ["model"],
+    buckets=_TOKEN_RATE_BUCKETS
+)
+
+# Caches (hit ratio = hit / (hit + miss))
+CACHE_REQUESTS = Counter("ytsumai_cache_requests_total", "Cache lookups", ["cache", "result"])
+
+# Pipeline, scheduling and jobs
+PIPELINE_SECONDS = Histogram(
+    "ytsumai_pipeline_seconds", "End-to-end processing time per video, excluding queueing",
+    ["mode", "status"], buckets=_STAGE_BUCKETS
+)
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "ytsumai_scheduler_wait_seconds", "Time runs waited for a worker", buckets=_STAGE_BUCKETS
+)
+SCHEDULER_WAITING = Gauge("ytsumai_scheduler_waiting", "Runs waiting for a worker")
+SCHEDULER_RUNNING = Gauge("ytsumai_scheduler_running", "Runs holding a worker")
+SCHEDULER_BACKLOG_SECONDS = Gauge(
+    "ytsumai_scheduler_backlog_seconds", "Estimated queued and remaining work per worker"
+)
+SCHEDULER_REAL_TIME_FACTOR = Gauge(
+    "ytsumai_scheduler_real_time_factor", "Estimated processing seconds per second of video", ["mode"]
+)
+SCHEDULER_REJECTED = Counter("ytsumai_scheduler_rejected_total", "Runs refused for a full backlog")
+JOBS = Gauge("ytsumai_jobs", "Background jobs by status", ["status"])
+BATCH_QUEUED = Gauge("ytsumai_batch_queued", "Batch items waiting for a stage", ["stage"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one cache lookup"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_transcription(model: str, elapsed: float, audio_seconds: float) -> None:
+    """Record one Whisper call on audio_seconds of audio"""
+    STT_SECONDS.labels(model).observe(elapsed)
+    STT_AUDIO_SECONDS.labels(model).inc(audio_seconds)
+    if audio_seconds > 0:
+        STT_REAL_TIME_FACTOR.labels(model).observe(elapsed / audio_seconds)
+
+
+def record_generation(model: str, response: dict) -> None:
+    """
+    Record token counts and speeds from a final Ollama generate response
+
+    Args:
+        model: Ollama model name
+        response: Response body (or the last streamed chunk) with Ollama's
+            prompt_eval_count/_duration and eval_count/_duration (nanoseconds)
+    """
+    LLM_REQUESTS.labels(model).inc()
+    for kind, prefix, rate in (
+        ("prompt", "prompt_eval", LLM_PROMPT_TOKENS_PER_SECOND),
+        ("generated", "eval", LLM_GENERATION_TOKENS_PER_SECOND),
+    ):
+        count = response.get(f"{prefix}_count") or 0
+        duration = response.get(f"{prefix}_duration") or 0
+        LLM_TOKENS.labels(model, kind).inc(count)
+        if count and duration:
+            rate.labels(model).observe(count / (duration / 1e9))
@@ -1,5 +1,11 @@
 """Data models for YTSumAI"""
 
-from .schemas import VideoMetadata, SummarizeRequest, SummarizeResponse
+from .schemas import (
+    VideoMetadata, SummarizeRequest, SummarizeResponse, TranscriptSegment, JobResponse,
+    BatchRequest, BatchItemResult
+)
 
-__all__ = ["VideoMetadata", "SummarizeRequest", "SummarizeResponse"]
+__all__ = [
+    "VideoMetadata", "SummarizeRequest", "SummarizeResponse", "TranscriptSegment", "JobResponse",
+    "BatchRequest", "BatchItemResult"
+]
@@ -1,6 +1,6 @@
 """Pydantic models for request/response validation"""
 
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, HttpUrl, Field
 
 
@@ -17,6 +17,10 @@ class SummarizeRequest(BaseModel):
     """Request model for video summarization"""
     url: HttpUrl = Field(..., description="YouTube video URL")
     max_duration: Optional[int] = Field(None, description="Maximum video duration in seconds")
+    mode: Literal["abstractive", "extractive"] = Field(
+        "abstractive",
+        description="abstractive: LLM summary; extractive: key transcript sentences, no LLM call"
+    )
 
 
 class TranscriptSegment(BaseModel):
@@ -30,7 +34,42 @@ class SummarizeResponse(BaseModel):
     """Response model containing transcript and summary"""
     metadata: VideoMetadata
     transcript: str
+    segments: List[TranscriptSegment] = Field(default_factory=list, description="Timestamped transcript segments")
     summary: str
     processing_time: float  # seconds
     transcript_word_count: int
     summary_word_count: int
+
+
+class JobResponse(BaseModel):
+    """Status of a background summarization job"""
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    stage: Optional[Literal["downloading", "transcribing", "summarizing"]] = None
+    progress: float = Field(0.0, description="Overall progress from 0 to 1")
+    message: Optional[str] = None
+    created_at: float  # Unix timestamp
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[SummarizeResponse] = None
+    error: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """Request model for summarizing several videos, playlists or channels"""
+    urls: List[HttpUrl] = Field(..., min_length=1, description="Video, playlist or channel URLs")
+    mode: Literal["abstractive", "extractive"] = Field(
+        "abstractive",
+        description="abstractive: LLM summary; extractive: key transcript sentences, no LLM call"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Outcome for one video of a batch (one NDJSON line)"""
+    index: int  # position in the expanded video list
+    total: int
+    url: str
+    status: Literal["completed", "failed"]
+    stage: Optional[Literal["download", "transcribe", "summarize"]] = None  # where it failed
+    result: Optional[SummarizeResponse] = None
+    error: Optional[str] = None
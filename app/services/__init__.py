@@ -3,5 +3,12 @@
 from app.services.downloader import YouTubeDownloader
 from app.services.transcriber import AudioTranscriber
 from app.services.summarizer import TextSummarizer
+from app.services.model_registry import WhisperModelRegistry, model_registry
 
-__all__ = ["YouTubeDownloader", "AudioTranscriber", "TextSummarizer"]
\ No newline at end of file
+__all__ = [
+    "YouTubeDownloader",
+    "AudioTranscriber",
+    "TextSummarizer",
+    "WhisperModelRegistry",
+    "model_registry",
+]
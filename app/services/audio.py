@@ -0,0 +1,236 @@
+"""Audio decoding into streamed PCM windows"""
+
+import queue
+import subprocess
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional
+import numpy as np
+from app.config import STREAM_BUFFER_MINUTES
+from app.metrics import DECODE_SECONDS
+
+
+# Whisper works on 16 kHz mono audio; decoding straight to that format means
+# every later stage (length checks, chunking, transcription) works on the same windows
+SAMPLE_RATE = 16000
+
+
+def stream_audio(
+    audio_file: Path,
+    window_samples: int,
+    sample_rate: int = SAMPLE_RATE
+) -> Iterator[np.ndarray]:
+    """
+    Decode an audio file in fixed-size windows read from an FFmpeg pipe
+
+    Only one window is held in memory at a time, so peak memory depends on
+    the window size rather than on the length of the video.
+
+    Args:
+        audio_file: Path to any audio/video file FFmpeg can read
+        window_samples: Number of samples per yielded window
+        sample_rate: Target sample rate (defaults to Whisper's 16 kHz)
+
+    Yields:
+        1-D float32 NumPy arrays of up to window_samples samples
+
+    Raises:
+        Exception: If FFmpeg fails to decode the file
+    """
+    # 16 kHz mono PCM WAV (AUDIO_FORMAT=pcm16k) is already in the target
+    # format; read it directly instead of piping it through FFmpeg
+    if _is_native_wav(audio_file, sample_rate):
+        yield from _stream_wav(audio_file, window_samples)
+        return
+
+    cmd = [
+        'ffmpeg', '-nostdin', '-v', 'error', '-threads', '0',
+        '-i', str(audio_file),
+        *pcm_output_args(sample_rate), 'pipe:1'
+    ]
+    yield from decode_pipe(cmd, window_samples)
+
+
+def pcm_output_args(sample_rate: int = SAMPLE_RATE) -> List[str]:
+    """FFmpeg output arguments for raw 16-bit mono PCM at the given sample rate"""
+    return ['-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate)]
+
+
+def decode_pipe(
+    cmd: List[str],
+    window_samples: int,
+    buffer_samples: int = STREAM_BUFFER_MINUTES * 60 * SAMPLE_RATE,
+    record: Callable[[float], None] = DECODE_SECONDS.observe
+) -> Iterator[np.ndarray]:
+    """
+    Run an FFmpeg command that writes raw 16-bit mono PCM to stdout and
+    yield it in fixed-size windows
+
+    The pipe is drained on a background thread, so FFmpeg keeps decoding
+    (and, for a streamed download, downloading) while the consumer works on
+    earlier windows. Up to buffer_samples of audio are read ahead; beyond
+    that FFmpeg is paused until the consumer catches up.
+
+    Args:
+        cmd: FFmpeg command line ending in pcm_output_args() + 'pipe:1'
+        window_samples: Number of samples per yielded window
+        buffer_samples: How much audio may be read ahead of the consumer
+        record: Called on success with the seconds spent waiting on FFmpeg's
+            output (not counting time FFmpeg was paused for the consumer)
+
+    Yields:
+        1-D float32 NumPy arrays of up to window_samples samples
+
+    Raises:
+        Exception: If FFmpeg is missing or exits with an error
+    """
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise Exception("FFmpeg not found. Please install FFmpeg to decode audio")
+
+    # Raw int16 bytes are queued (half the size of float32 windows)
+    reader = _PipeReader(process.stdout, window_samples * 2, max(2, buffer_samples // window_samples))
+    reader.start()
+    try:
+        while True:
+            data = reader.get()
+            if data is None:
+                break
+            yield _pcm16_to_float(data)
+
+        process.wait()
+        if process.returncode != 0:
+            error = process.stderr.read().decode(errors='ignore').strip()
+            raise Exception(f"Failed to decode audio: {error}")
+        record(reader.waited)
+    finally:
+        reader.stop()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        reader.join()
+        process.stdout.close()
+        process.stderr.close()
+
+
+class _PipeReader:
+    """Background thread reading fixed-size blocks from a pipe into a bounded queue"""
+
+    def __init__(self, stream: BinaryIO, block_bytes: int, max_blocks: int):
+        self.stream = stream
+        self.block_bytes = block_bytes
+        self.waited = 0.0  # seconds blocked on the pipe
+        self._blocks = queue.Queue(maxsize=max_blocks)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="pipe-reader")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def get(self) -> Optional[bytes]:
+        """Next block, or None at the end of the stream"""
+        return self._blocks.get()
+
+    def stop(self) -> None:
+        """Stop reading; a reader waiting for queue space gives up"""
+        self._stopped.set()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                start = time.perf_counter()
+                data = self.stream.read(self.block_bytes)
+                self.waited += time.perf_counter() - start
+                # A short read means FFmpeg is done
+                done = len(data) < self.block_bytes
+                # Drop a trailing odd byte so blocks hold whole samples
+                data = data[:len(data) - len(data) % 2]
+                if data:
+                    self._put(data)
+                if done:
+                    break
+        except (OSError, ValueError):
+            pass  # Pipe closed under us; the process exit status tells the story
+        finally:
+            self._put(None)
+
+    def _put(self, block: Optional[bytes]) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._blocks.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def probe_duration(audio_file: Path) -> Optional[float]:
+    """
+    Read a file's duration from its container metadata using ffprobe
+
+    Args:
+        audio_file: Path to audio file
+
+    Returns:
+        Duration in seconds, or None if it could not be determined
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries',
+             'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1',
+             str(audio_file)],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+
+def duration_seconds(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
+    """
+    Length of a decoded PCM buffer in seconds
+
+    Args:
+        audio: Decoded PCM buffer
+        sample_rate: Sample rate of the buffer
+
+    Returns:
+        Duration in seconds
+    """
+    return len(audio) / sample_rate
+
+
+def _is_native_wav(audio_file: Path, sample_rate: int) -> bool:
+    """Check whether a file is 16-bit mono PCM WAV at the given sample rate"""
+    if Path(audio_file).suffix.lower() != '.wav':
+        return False
+    try:
+        with wave.open(str(audio_file), 'rb') as wav:
+            return (wav.getnchannels() == 1 and wav.getsampwidth() == 2
+                    and wav.getframerate() == sample_rate)
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def _stream_wav(audio_file: Path, window_samples: int) -> Iterator[np.ndarray]:
+    """Yield windows from a 16-bit mono PCM WAV file without FFmpeg"""
+    with wave.open(str(audio_file), 'rb') as wav:
+        while True:
+            data = wav.readframes(window_samples)
+            if not data:
+                break
+            yield _pcm16_to_float(data)
+
+
+def _pcm16_to_float(data) -> np.ndarray:
+    """Convert little-endian int16 PCM bytes to float32 samples in [-1.0, 1.0]"""
+    samples = np.frombuffer(data, np.int16).astype(np.float32)
+    samples *= 1.0 / 32768.0  # in place, avoids a second full-size array
+    return samples
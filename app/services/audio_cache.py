@@ -0,0 +1,158 @@
+"""Managed cache of downloaded audio files with a disk budget"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from app.config import DOWNLOAD_DIR, AUDIO_CACHE_MAX_MB
+from app.metrics import record_cache
+
+
+AUDIO_EXTENSIONS = ('mp3', 'wav', 'm4a', 'opus', 'webm', 'ogg')
+
+
+class AudioCache:
+    """
+    Keeps downloaded audio keyed by video ID and evicts least recently used
+    files once the directory exceeds its disk budget.
+
+    Files pinned by in-flight jobs are never evicted, so one request can't
+    delete audio another request is still transcribing.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DOWNLOAD_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_MB * 1024 * 1024
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}
+
+        # video_id -> path, least recently used first
+        self._entries: "OrderedDict[str, Path]" = OrderedDict()
+        files = []
+        for ext in AUDIO_EXTENSIONS:
+            for path in self.directory.glob(f"*.{ext}"):
+                if '.' in path.stem:
+                    continue  # Partial download or conversion ({id}.*.partial.{ext})
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue
+        for _, path in sorted(files):
+            self._entries[path.stem] = path
+
+    def lookup(self, video_id: str) -> Optional[Path]:
+        """
+        Find cached audio for a video and mark it as recently used
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Path to the audio file, or None if not cached
+        """
+        with self._lock:
+            path = self._entries.get(video_id)
+            if path is not None and not path.exists():
+                del self._entries[video_id]
+                path = None
+            if path is None:
+                record_cache("audio", hit=False)
+                return None
+            self._entries.move_to_end(video_id)
+        record_cache("audio", hit=True)
+
+        try:
+            path.touch()
+        except OSError:
+            pass
+        return path
+
+    def add(self, video_id: str, path: Path) -> None:
+        """
+        Register a downloaded file and evict old entries over the budget
+
+        Args:
+            video_id: YouTube video ID
+            path: Downloaded audio file
+        """
+        with self._lock:
+            old = self._entries.pop(video_id, None)
+            if old is not None and old != path:
+                self._delete(old)
+            self._entries[video_id] = path
+            self._evict()
+
+    def discard(self, video_id: str) -> None:
+        """Remove a video's audio (e.g. when the file turned out to be invalid)"""
+        with self._lock:
+            path = self._entries.pop(video_id, None)
+            if path is not None:
+                self._delete(path)
+
+    def pin(self, video_id: str) -> None:
+        """Protect a video's audio from eviction until unpin() is called"""
+        with self._lock:
+            self._pins[video_id] = self._pins.get(video_id, 0) + 1
+
+    def unpin(self, video_id: str) -> None:
+        """Release one pin taken with pin()"""
+        with self._lock:
+            count = self._pins.get(video_id, 0) - 1
+            if count > 0:
+                self._pins[video_id] = count
+            else:
+                self._pins.pop(video_id, None)
+            self._evict()
+
+    @contextmanager
+    def pinned(self, video_id: str) -> Iterator[None]:
+        """Context manager that pins a video's audio for the duration of a block"""
+        self.pin(video_id)
+        try:
+            yield
+        finally:
+            self.unpin(video_id)
+
+    def total_bytes(self) -> int:
+        """Current size of all cached audio on disk"""
+        with self._lock:
+            return sum(self._size(path) for path in self._entries.values())
+
+    def _evict(self) -> None:
+        """Delete least recently used, unpinned files until under budget (caller holds the lock)"""
+        total = sum(self._size(path) for path in self._entries.values())
+        for video_id in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if self._pins.get(video_id):
+                continue
+            path = self._entries.pop(video_id)
+            total -= self._size(path)
+            self._delete(path)
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _delete(path: Path) -> None:
+        try:
+            path.unlink()
+            print(f"Evicted cached audio: {path.name}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Failed to remove {path}: {str(e)}")
+
+
+# Shared by every downloader in the process so pins are seen by all requests
+audio_cache = AudioCache()
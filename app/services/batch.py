@@ -0,0 +1,274 @@
+"""Batch summarization of many videos with pipelined stages"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+from app.config import BATCH_DOWNLOAD_WORKERS, BATCH_STT_WORKERS, BATCH_LLM_WORKERS
+from app.metrics import BATCH_QUEUED
+from app.models.schemas import BatchItemResult, SummarizeResponse, VideoMetadata
+from app.services.downloader import YouTubeDownloader, extract_video_id
+from app.services.extractive import ExtractiveSummarizer
+from app.services.scheduler import JobScheduler, job_scheduler
+from app.services.transcriber import AudioTranscriber
+from app.services.summarizer import TextSummarizer
+
+
+class _Item:
+    """One video moving through the stages"""
+
+    def __init__(self, index: int, total: int, url: str):
+        self.index = index
+        self.total = total
+        self.url = url
+        self.start_time = 0.0
+        self.audio_file: Optional[Path] = None
+        self.metadata: Optional[VideoMetadata] = None
+        self.transcript = ""
+        self.segments = None
+        self.summary = ""
+
+
+class _Stage:
+    """Worker threads taking items from one queue and passing them to the next"""
+
+    def __init__(
+        self,
+        name: str,
+        work: Callable[[_Item], None],
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue],
+        workers: int,
+        next_name: Optional[str],
+        next_workers: int
+    ):
+        self.name = name
+        self.work = work
+        self.inbox = inbox
+        self.outbox = outbox
+        self.workers = workers
+        self.next_name = next_name
+        self.next_workers = next_workers
+        self._running = workers
+        self._lock = threading.Lock()
+
+    def start(self, runner: "BatchRunner", results: queue.Queue, stop: threading.Event) -> None:
+        for i in range(self.workers):
+            threading.Thread(
+                target=self._loop, args=(runner, results, stop), daemon=True,
+                name=f"batch-{self.name}-{i}"
+            ).start()
+
+    def _loop(self, runner: "BatchRunner", results: queue.Queue, stop: threading.Event) -> None:
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                break
+            BATCH_QUEUED.labels(self.name).dec()
+            if stop.is_set():
+                # Consumer is gone; drain without working
+                runner._release(item)
+                continue
+            try:
+                self.work(item)
+            except Exception as e:
+                print(f"❌ Batch item {item.index} failed at {self.name}: {str(e)}")
+                runner._release(item)
+                results.put(runner._failed(item, self.name, e))
+                continue
+            if self.outbox is not None:
+                BATCH_QUEUED.labels(self.next_name).inc()
+                self.outbox.put(item)
+            else:
+                results.put(runner._completed(item))
+
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last and self.outbox is not None:
+            # Let the next stage's workers finish once everything upstream has
+            for _ in range(self.next_workers):
+                self.outbox.put(None)
+
+
+class BatchRunner:
+    """
+    Summarizes many videos with download, transcription and summarization
+    running as a pipeline
+
+    Each stage has its own worker count: several downloads (network-bound)
+    keep the transcription workers (CPU/GPU-bound) fed, which in turn feed
+    the summarization workers (Ollama-bound). The queues between stages are
+    bounded, so downloads never run far ahead of transcription and fill the
+    disk. Results come back in completion order; a failed video is reported
+    and the rest of the batch carries on.
+
+    Transcription takes a slot in the shared JobScheduler, so batch Whisper
+    work queues with API runs (shortest first) and counts toward their
+    backlog instead of running alongside the JOB_WORKERS limit.
+    """
+
+    def __init__(
+        self,
+        downloader: Optional[YouTubeDownloader] = None,
+        transcriber: Optional[AudioTranscriber] = None,
+        summarizer: Optional[TextSummarizer] = None,
+        download_workers: int = BATCH_DOWNLOAD_WORKERS,
+        stt_workers: int = BATCH_STT_WORKERS,
+        llm_workers: int = BATCH_LLM_WORKERS,
+        scheduler: JobScheduler = job_scheduler
+    ):
+        self.downloader = downloader or YouTubeDownloader()
+        self.transcriber = transcriber or AudioTranscriber()
+        self.summarizer = summarizer or TextSummarizer()
+        self.extractive = ExtractiveSummarizer()
+        self.download_workers = download_workers
+        self.stt_workers = stt_workers
+        self.llm_workers = llm_workers
+        self.scheduler = scheduler
+
+    def expand(self, urls: List[str]) -> List[str]:
+        """
+        Expand playlist and channel URLs into video URLs, dropping duplicates
+
+        Args:
+            urls: Video, playlist or channel URLs
+
+        Returns:
+            Video URLs in input order
+
+        Raises:
+            Exception: If a playlist or channel can't be listed
+        """
+        videos, seen = [], set()
+        for url in urls:
+            for video_url in self.downloader.expand_urls(url):
+                key = extract_video_id(video_url) or video_url
+                if key not in seen:
+                    seen.add(key)
+                    videos.append(video_url)
+        print(f"📋 Batch of {len(videos)} videos from {len(urls)} URLs")
+        return videos
+
+    def check_admission(self) -> None:
+        """
+        Check that the scheduler is accepting work before starting a batch
+
+        Raises:
+            BacklogFullError: If the server has too much work queued
+        """
+        self.scheduler.check()
+
+    def run(self, urls: List[str], mode: str = "abstractive") -> Iterator[BatchItemResult]:
+        """
+        Summarize videos, yielding each result as soon as it is ready
+
+        Closing the iterator early stops the batch: items already in a stage
+        finish it, nothing new is started.
+
+        Args:
+            urls: Video URLs (see expand() for playlists and channels)
+            mode: "abstractive" (LLM) or "extractive" (key sentences, no LLM)
+
+        Yields:
+            One BatchItemResult per video, in completion order
+        """
+        if not urls:
+            return
+
+        todo = queue.Queue()
+        # Bounded hand-offs: a stage blocks once the next one has enough queued
+        downloaded = queue.Queue(maxsize=self.stt_workers)
+        transcribed = queue.Queue(maxsize=self.llm_workers)
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def transcribe(item: _Item) -> None:
+            self._transcribe(item, mode)
+
+        def summarize(item: _Item) -> None:
+            self._summarize(item, mode)
+
+        stages = [
+            _Stage("download", self._download, todo, downloaded,
+                   self.download_workers, "transcribe", self.stt_workers),
+            _Stage("transcribe", transcribe, downloaded, transcribed,
+                   self.stt_workers, "summarize", self.llm_workers),
+            _Stage("summarize", summarize, transcribed, None, self.llm_workers, None, 0),
+        ]
+
+        for index, url in enumerate(urls):
+            todo.put(_Item(index, len(urls), url))
+        BATCH_QUEUED.labels("download").inc(len(urls))
+        for _ in range(self.download_workers):
+            todo.put(None)
+        for stage in stages:
+            stage.start(self, results, stop)
+
+        try:
+            for _ in range(len(urls)):
+                yield results.get()
+        finally:
+            stop.set()
+
+    def _download(self, item: _Item) -> None:
+        item.start_time = time.time()
+        item.audio_file, item.metadata = self.downloader.download_audio(item.url)
+
+    def _transcribe(self, item: _Item, mode: str) -> None:
+        try:
+            # The batch was admitted as a whole; its items queue regardless
+            ticket = self.scheduler.submit(item.metadata.duration, mode, enforce_limit=False)
+            try:
+                self.scheduler.wait(ticket)
+                item.transcript, item.segments = self.transcriber.transcribe_with_segments(
+                    item.audio_file, video_id=item.metadata.video_id
+                )
+            finally:
+                # Only the transcription ran under the ticket, which isn't
+                # what the cost model estimates
+                self.scheduler.finish(ticket, observe=False)
+        finally:
+            self._release(item)
+
+    def _summarize(self, item: _Item, mode: str) -> None:
+        if mode == "extractive":
+            item.summary = self.extractive.summarize(item.transcript, self.summarizer.max_summary_length)
+        else:
+            item.summary = self.summarizer.summarize(item.transcript)
+        if not item.summary:
+            raise Exception("Summarization failed: Empty summary received from model")
+
+    def _release(self, item: _Item) -> None:
+        """Unpin the item's audio, if it still holds it"""
+        if item.audio_file is not None:
+            item.audio_file = None
+            self.downloader.release_audio(item.metadata.video_id)
+
+    def _completed(self, item: _Item) -> BatchItemResult:
+        return BatchItemResult(
+            index=item.index,
+            total=item.total,
+            url=item.url,
+            status="completed",
+            result=SummarizeResponse(
+                metadata=item.metadata,
+                transcript=item.transcript,
+                segments=item.segments,
+                summary=item.summary,
+                processing_time=time.time() - item.start_time,
+                transcript_word_count=len(item.transcript.split()),
+                summary_word_count=len(item.summary.split())
+            )
+        )
+
+    def _failed(self, item: _Item, stage: str, error: Exception) -> BatchItemResult:
+        return BatchItemResult(
+            index=item.index,
+            total=item.total,
+            url=item.url,
+            status="failed",
+            stage=stage,
+            error=str(error)
+        )
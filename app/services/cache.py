@@ -0,0 +1,309 @@
+"""Disk-backed caches for pipeline results"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from app.config import CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB, LLM_CACHE_MAX_MB
+from app.metrics import record_cache
+from app.models.schemas import TranscriptSegment
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts
+
+    Args:
+        parts: Values that together identify a cached result
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_file(path: Path, block_size: int = 1 << 20) -> str:
+    """
+    Hash a file's contents without reading it into memory at once
+
+    Args:
+        path: File to hash
+        block_size: Bytes read per iteration
+
+    Returns:
+        Hex SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Size-bounded JSON store with LRU eviction and atomic writes"""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # key -> size in bytes, least recently used first. File mtimes carry
+        # recency across restarts.
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, record: bool = True) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key from make_key()
+            record: Count the lookup in the cache hit/miss metrics
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self._forget(key)
+            if record:
+                record_cache(self.directory.name, hit=False)
+            return None
+        if record:
+            record_cache(self.directory.name, hit=True)
+
+        with self._lock:
+            if key not in self._index:
+                # Written by another process sharing the directory
+                size = path.stat().st_size
+                self._index[key] = size
+                self._total_bytes += size
+            self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries over the size budget
+
+        The value is written to a temp file and renamed into place, so readers
+        never see a partially written entry.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable value
+        """
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _forget(self, key: str) -> None:
+        """Drop a key from the index (caller holds the lock)"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under budget (caller holds the lock)"""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+
+class TranscriptCache(DiskCache):
+    """
+    Caches transcripts by audio content and decode settings
+
+    A small pointer entry per (video, model, settings) names the latest
+    transcript's key, so a repeat request can find it before (or without)
+    downloading the audio its key is hashed from.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR / "transcripts",
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024
+    ):
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def key_for(video_id: Optional[str], audio_hash: str, model_size: str, options: dict) -> str:
+        """
+        Build the cache key for a transcription
+
+        Args:
+            video_id: YouTube video ID (if known)
+            audio_hash: SHA-256 of the audio file contents
+            model_size: Whisper model size
+            options: Decode options that affect the output (language, VAD, chunking, ...)
+
+        Returns:
+            Cache key
+        """
+        return make_key("transcript", video_id or "", audio_hash, model_size, options)
+
+    def get_transcript(self, key: str) -> Optional[Tuple[str, List[TranscriptSegment]]]:
+        """
+        Look up a cached transcript
+
+        Args:
+            key: Key from key_for()
+
+        Returns:
+            Tuple of (transcript, segments), or None on a miss
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        return value['text'], [TranscriptSegment(**seg) for seg in value['segments']]
+
+    def set_transcript(self, key: str, transcript: str, segments: List[TranscriptSegment]) -> None:
+        """
+        Store a transcript
+
+        Args:
+            key: Key from key_for()
+            transcript: Transcript text
+            segments: Timestamped segments
+        """
+        self.set(key, {'text': transcript, 'segments': [seg.model_dump() for seg in segments]})
+
+    def set_latest(self, video_id: str, model_size: str, options: dict, key: str) -> None:
+        """
+        Remember a transcript as the latest for a video and settings
+
+        Args:
+            video_id: YouTube video ID
+            model_size: Whisper model size
+            options: Decode options, as passed to key_for()
+            key: Key of the stored transcript
+        """
+        self.set(make_key("transcript-latest", video_id, model_size, options), {'key': key})
+
+    def get_latest(
+        self, video_id: str, model_size: str, options: dict
+    ) -> Optional[Tuple[str, List[TranscriptSegment]]]:
+        """
+        Look up the latest transcript for a video and settings, without its audio
+
+        Not counted in the cache metrics; the caller records the outcome.
+
+        Args:
+            video_id: YouTube video ID
+            model_size: Whisper model size
+            options: Decode options, as passed to key_for()
+
+        Returns:
+            Tuple of (transcript, segments), or None on a miss
+        """
+        pointer = self.get(make_key("transcript-latest", video_id, model_size, options), record=False)
+        if pointer is None:
+            return None
+        value = self.get(pointer['key'], record=False)
+        if value is None:
+            return None
+        return value['text'], [TranscriptSegment(**seg) for seg in value['segments']]
+
+
+class ResponseCache(DiskCache):
+    """Caches LLM responses by model, options and prompt"""
+    
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR / "llm",
+        max_bytes: int = LLM_CACHE_MAX_MB * 1024 * 1024
+    ):
+        super().__init__(directory, max_bytes)
+    
+    @staticmethod
+    def key_for(model: str, options: dict, prompt: str) -> str:
+        """
+        Build the cache key for a generation
+        
+        Args:
+            model: Ollama model name
+            options: Generation options (temperature, num_ctx, ...)
+            prompt: Full prompt text
+            
+        Returns:
+            Cache key
+        """
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return make_key("llm", model, options, prompt_hash)
+    
+    def get_response(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+        
+        Args:
+            key: Key from key_for()
+            
+        Returns:
+            Response text, or None on a miss
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        return value['response']
+    
+    def set_response(self, key: str, response: str) -> None:
+        """
+        Store a response
+        
+        Args:
+            key: Key from key_for()
+            response: Generated text
+        """
+        self.set(key, {'response': response})
+
+
+# Shared by every transcriber in the process so the LRU index stays consistent
+transcript_cache = TranscriptCache()
+# Shared by every summarizer in the process
+response_cache = ResponseCache()
@@ -0,0 +1,167 @@
+"""Token-aware text chunking for LLM prompts"""
+
+import math
+import re
+from typing import List, Tuple
+
+
+# Words, numbers and individual punctuation marks, roughly how BPE
+# tokenizers split English text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Break after sentence-ending punctuation, or at line breaks
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+
+# Average characters per token for a word; longer words cost more tokens
+_CHARS_PER_TOKEN = 6
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the number of LLM tokens in a text
+
+    Fast and tokenizer-free; errs slightly high for English prose, so
+    budgets computed from it leave a little headroom.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count
+    """
+    return sum(
+        math.ceil(len(piece) / _CHARS_PER_TOKEN)
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences (or lines), dropping empty pieces
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of sentences in order
+    """
+    return [s.strip() for s in _SENTENCE_BREAK.split(text) if s.strip()]
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens, on sentence boundaries
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget per chunk
+        overlap_tokens: Up to this many tokens of trailing sentences are
+            repeated at the start of the next chunk for context
+
+    Returns:
+        List of chunks in order
+    """
+    chunker = TextChunker(max_tokens, overlap_tokens)
+    return chunker.add(text) + chunker.finish()
+
+
+class TextChunker:
+    """
+    Packs sentences into token-budgeted chunks as text arrives
+
+    Text can be added in arbitrary pieces (e.g. transcript chunks); a
+    sentence cut off at the end of one piece is held back until the next.
+    Feeding punctuated text piece by piece yields the same chunks as
+    chunk_text() on the whole text.
+    """
+
+    def __init__(self, max_tokens: int, overlap_tokens: int = 0):
+        if max_tokens <= 0:
+            raise ValueError(f"Chunk budget must be positive, got {max_tokens} tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+        self._tail = ""  # unfinished sentence from the last piece
+        self._units: List[Tuple[str, int]] = []  # (sentence, tokens) in the open chunk
+        self._tokens = 0
+        self._fresh = 0  # sentences in the open chunk that aren't overlap
+
+    def add(self, text: str) -> List[str]:
+        """
+        Add the next piece of text
+
+        Args:
+            text: Text following everything added so far
+
+        Returns:
+            Chunks completed by this piece (possibly none)
+        """
+        text = f"{self._tail} {text}" if self._tail else text
+        sentences = split_sentences(text)
+        self._tail = ""
+        if sentences and not _SENTENCE_END.search(sentences[-1]):
+            # Wait for the rest of the sentence, unless it's already too big
+            # to ever fit (e.g. unpunctuated text)
+            if count_tokens(sentences[-1]) <= self.max_tokens:
+                self._tail = sentences.pop()
+        return self._pack(sentences)
+
+    def finish(self) -> List[str]:
+        """
+        Flush the remaining text once everything has been added
+
+        Returns:
+            The final chunk(s)
+        """
+        chunks = self._pack(split_sentences(self._tail))
+        self._tail = ""
+        if self._fresh:
+            chunks.append(self._emit())
+        self._units, self._tokens, self._fresh = [], 0, 0
+        return chunks
+
+    def _pack(self, sentences: List[str]) -> List[str]:
+        chunks = []
+        for sentence in sentences:
+            for piece in self._fit(sentence):
+                tokens = count_tokens(piece)
+                if self._tokens + tokens > self.max_tokens:
+                    if self._fresh:
+                        chunks.append(self._emit())
+                    if self._tokens + tokens > self.max_tokens:
+                        # Overlap alone leaves no room; start clean
+                        self._units, self._tokens = [], 0
+                self._units.append((piece, tokens))
+                self._tokens += tokens
+                self._fresh += 1
+        return chunks
+
+    def _emit(self) -> str:
+        """Close the open chunk, keeping trailing sentences as overlap"""
+        chunk = " ".join(sentence for sentence, _ in self._units)
+        carry, carried = [], 0
+        for sentence, tokens in reversed(self._units):
+            if carried + tokens > self.overlap_tokens:
+                break
+            carry.append((sentence, tokens))
+            carried += tokens
+        self._units = carry[::-1]
+        self._tokens = carried
+        self._fresh = 0
+        return chunk
+
+    def _fit(self, sentence: str) -> List[str]:
+        """Split a sentence that exceeds the budget on its own at word boundaries"""
+        if count_tokens(sentence) <= self.max_tokens:
+            return [sentence]
+        pieces, words, tokens = [], [], 0
+        for word in sentence.split():
+            word_tokens = count_tokens(word)
+            if words and tokens + word_tokens > self.max_tokens:
+                pieces.append(" ".join(words))
+                words, tokens = [], 0
+            words.append(word)
+            tokens += word_tokens
+        if words:
+            pieces.append(" ".join(words))
+        return pieces
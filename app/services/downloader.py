@@ -1,41 +1,114 @@
 """YouTube audio downloader using yt-dlp"""
 
+import copy
 import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
 import yt_dlp
-from app.config import DOWNLOAD_DIR, AUDIO_FORMAT, AUDIO_BITRATE, MAX_VIDEO_DURATION
+from app.config import (
+    DOWNLOAD_DIR, AUDIO_FORMAT, AUDIO_BITRATE, OPUS_BITRATE, MAX_VIDEO_DURATION,
+    STREAMING_DOWNLOAD, BATCH_MAX_VIDEOS
+)
+from app.metrics import (
+    AUDIO_CACHE_WRITTEN_BYTES, DOWNLOAD_BYTES, DOWNLOAD_FIRST_AUDIO_SECONDS, DOWNLOAD_SECONDS
+)
 from app.models.schemas import VideoMetadata
+from app.services.audio import SAMPLE_RATE, decode_pipe, pcm_output_args, stream_audio
+from app.services.audio_cache import AudioCache, audio_cache
+from app.services.metadata_cache import MetadataCache, metadata_cache
+
+
+# File extension and FFmpeg encoder arguments for each supported AUDIO_FORMAT.
+# The 16 kHz mono formats match what Whisper consumes, so nothing is spent
+# encoding (or later decoding) sample rates and channels it throws away.
+CONVERSION_ARGS = {
+    'mp3': ('mp3', ['-c:a', 'libmp3lame', '-b:a', AUDIO_BITRATE]),
+    'wav': ('wav', ['-c:a', 'pcm_s16le']),
+    'pcm16k': ('wav', ['-ac', '1', '-ar', str(SAMPLE_RATE), '-c:a', 'pcm_s16le']),
+    'opus16k': ('opus', ['-ac', '1', '-ar', str(SAMPLE_RATE), '-c:a', 'libopus',
+                         '-b:a', OPUS_BITRATE, '-application', 'voip']),
+}
+
+# Format used for AUDIO_FORMAT=auto: small on disk and cheap to decode at the
+# STT model's native sample rate
+AUTO_AUDIO_FORMAT = 'opus16k'
+
+# Extracted info dicts are kept briefly so the download right after a metadata
+# lookup (e.g. admission control) doesn't extract the page again. Well below
+# the lifetime of YouTube's signed stream URLs.
+_INFO_TTL_SECONDS = 300
+_INFO_MAX_ENTRIES = 32
+
+_VIDEO_ID_PATTERN = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/|v/)|youtu\.be/)([A-Za-z0-9_-]{11})'
+)
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    Parse the YouTube video ID out of a URL without any network access
+    
+    Args:
+        url: YouTube video URL
+        
+    Returns:
+        11-character video ID, or None if the URL isn't a recognized YouTube URL
+    """
+    match = _VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
 
 
 class YouTubeDownloader:
     """Downloads audio from YouTube videos"""
     
-    def __init__(self):
+    def __init__(self, cache: AudioCache = audio_cache, metadata: MetadataCache = metadata_cache):
         self.download_dir = DOWNLOAD_DIR
-        self.audio_format = AUDIO_FORMAT
+        supported = ['auto', 'native', *CONVERSION_ARGS]
+        if AUDIO_FORMAT not in supported:
+            # Fail at startup rather than with a KeyError in the first download
+            raise ValueError(
+                f"Unsupported AUDIO_FORMAT '{AUDIO_FORMAT}'. Supported: {', '.join(supported)}"
+            )
+        self.audio_format = AUTO_AUDIO_FORMAT if AUDIO_FORMAT == 'auto' else AUDIO_FORMAT
+        self.cache = cache
+        self.metadata_cache = metadata
+        self._infos: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._infos_lock = threading.Lock()
         
-    def cleanup_old_files(self, keep_video_id: str = None) -> None:
+    def release_audio(self, video_id: str) -> None:
         """
-        Clean up old audio files before downloading new ones
+        Release the pin taken by download_audio() once the caller is done with the file
         
         Args:
-            keep_video_id: Optional video ID to keep, delete all others
+            video_id: YouTube video ID returned in the metadata
         """
-        try:
-            if self.download_dir.exists():
-                for ext in ['mp3', 'wav', 'm4a']:
-                    for file in self.download_dir.glob(f"*.{ext}"):
-                        # If keep_video_id is specified, skip that file
-                        if keep_video_id and keep_video_id in file.stem:
-                            continue
-                        try:
-                            os.remove(file)
-                            print(f"Cleaned up old file: {file.name}")
-                        except Exception as e:
-                            print(f"Failed to cleanup {file}: {str(e)}")
-        except Exception as e:
-            print(f"Error during cleanup: {str(e)}")
+        self.cache.unpin(video_id)
+        
+    def _cached_audio(self, video_id: str) -> Optional[Path]:
+        """
+        Return a valid cached audio file for a video, dropping corrupt entries
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Path to the cached file, or None if it must be downloaded
+        """
+        audio_file = self.cache.lookup(video_id)
+        if audio_file is None:
+            return None
+        if audio_file.stat().st_size < 1024 or not self._validate_audio_file(audio_file):
+            print(f"Cached audio is invalid, re-downloading: {audio_file.name}")
+            self.cache.discard(video_id)
+            return None
+        return audio_file
         
     def _validate_audio_file(self, audio_file: Path) -> bool:
         """
@@ -62,9 +135,177 @@ class YouTubeDownloader:
             print(f"Audio validation failed: {e}")
             return False
     
+    def _ydl_options(self) -> Dict:
+        """
+        Build yt-dlp options for downloading the native audio stream
+        
+        No postprocessors: the source container (opus/m4a) is kept as-is and
+        any conversion happens afterwards, so a failed conversion never
+        requires downloading the stream again.
+        
+        Returns:
+            yt-dlp options dict
+        """
+        return {
+            'format': 'bestaudio/best',
+            'outtmpl': str(self.download_dir / '%(id)s.%(ext)s'),
+            'quiet': False,
+            'no_warnings': False,
+            # Additional options to bypass YouTube blocking
+            'nocheckcertificate': True,
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
+            'prefer_ffmpeg': True,
+        }
+    
+    @staticmethod
+    def _check_duration(duration: int) -> None:
+        """Raise ValueError if a video is longer than MAX_VIDEO_DURATION"""
+        if duration > MAX_VIDEO_DURATION:
+            raise ValueError(
+                f"Video duration ({duration}s) exceeds maximum allowed "
+                f"({MAX_VIDEO_DURATION}s)"
+            )
+    
+    def _extract_info(self, url: str) -> Tuple[Dict, VideoMetadata]:
+        """
+        Run yt-dlp extraction once and cache the resulting metadata
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            Tuple of (yt-dlp info dict, video_metadata)
+        """
+        with yt_dlp.YoutubeDL(self._ydl_options()) as ydl:
+            info = ydl.extract_info(url, download=False)
+        
+        metadata = VideoMetadata(
+            title=info.get('title', 'Unknown'),
+            duration=info.get('duration') or 0,
+            channel=info.get('uploader', 'Unknown'),
+            video_id=info.get('id', ''),
+            url=url
+        )
+        self.metadata_cache.set(metadata)
+        with self._infos_lock:
+            self._infos[metadata.video_id] = (time.monotonic(), info)
+            self._infos.move_to_end(metadata.video_id)
+            while len(self._infos) > _INFO_MAX_ENTRIES:
+                self._infos.popitem(last=False)
+        return info, metadata
+    
+    def _recent_info(self, video_id: str) -> Optional[Dict]:
+        """Info dict from an extraction in the last _INFO_TTL_SECONDS, if any"""
+        with self._infos_lock:
+            entry = self._infos.get(video_id)
+            if entry is None or time.monotonic() - entry[0] > _INFO_TTL_SECONDS:
+                return None
+            return entry[1]
+    
+    def get_metadata(self, url: str) -> VideoMetadata:
+        """
+        Get video metadata, from the metadata cache when possible
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            Video metadata
+            
+        Raises:
+            ValueError: If the video is too long
+        """
+        metadata = self._cached_metadata(url)
+        if metadata is None:
+            _, metadata = self._extract_info(url)
+        self._check_duration(metadata.duration)
+        return metadata
+    
+    def expand_urls(self, url: str, limit: int = BATCH_MAX_VIDEOS) -> List[str]:
+        """
+        Expand a playlist or channel URL into individual video URLs
+        
+        Uses yt-dlp flat extraction, so only the listing is fetched, not each
+        video's page. Plain video URLs are returned as-is without network access.
+        
+        Args:
+            url: Video, playlist or channel URL
+            limit: Maximum number of videos to return
+            
+        Returns:
+            Video URLs in playlist order
+        """
+        if extract_video_id(url) and 'list=' not in url:
+            return [url]
+        
+        options = {
+            'extract_flat': 'in_playlist',
+            'playlistend': limit,
+            'quiet': True,
+            'no_warnings': True,
+            'nocheckcertificate': True,
+        }
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(url, download=False)
+            urls = self._flat_video_urls(ydl, info, limit)
+        
+        if not urls and extract_video_id(url):
+            return [url]
+        return urls[:limit]
+    
+    def _flat_video_urls(self, ydl: yt_dlp.YoutubeDL, info: Dict, limit: int, depth: int = 0) -> List[str]:
+        """
+        Collect watch URLs from a flat-extracted playlist, descending into
+        nested playlists and channel tabs (Videos, Shorts, ...)
+        """
+        if info.get('_type') not in ('playlist', 'multi_video'):
+            video_id = info.get('id')
+            return [f"https://www.youtube.com/watch?v={video_id}"] if video_id else []
+        
+        urls = []
+        for entry in info.get('entries') or []:
+            if len(urls) >= limit or not entry:
+                break
+            video_id = entry.get('id') or ''
+            if entry.get('_type') == 'playlist':
+                if depth < 2:
+                    urls.extend(self._flat_video_urls(ydl, entry, limit - len(urls), depth + 1))
+            elif entry.get('ie_key') == 'YoutubeTab' and entry.get('url') and depth < 2:
+                # Channel tab that flat extraction didn't expand
+                tab = ydl.extract_info(entry['url'], download=False)
+                urls.extend(self._flat_video_urls(ydl, tab, limit - len(urls), depth + 1))
+            elif re.fullmatch(r'[A-Za-z0-9_-]{11}', video_id):
+                urls.append(f"https://www.youtube.com/watch?v={video_id}")
+        return urls
+    
+    def _cached_metadata(self, url: str) -> Optional[VideoMetadata]:
+        """
+        Look up metadata by the video ID parsed from the URL, without network access
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            Cached metadata (with this request's URL), or None
+        """
+        video_id = extract_video_id(url)
+        metadata = self.metadata_cache.get(video_id) if video_id else None
+        if metadata is None:
+            return None
+        return metadata.model_copy(update={'url': url})
+    
     def download_audio(self, url: str) -> Tuple[Path, VideoMetadata]:
         """
-        Download audio from YouTube video
+        Download audio from YouTube video, reusing a cached copy if present
+        
+        The page is extracted at most once per call and the info dict is reused
+        for the download. When both the metadata and the audio are cached,
+        yt-dlp is not called at all. The native stream is kept and, unless
+        AUDIO_FORMAT asks for a conversion, used directly.
+        
+        The returned file is pinned in the audio cache so concurrent requests
+        can't evict it; call release_audio(metadata.video_id) when done with it.
         
         Args:
             url: YouTube video URL
@@ -73,88 +314,350 @@ class YouTubeDownloader:
             Tuple of (audio_file_path, video_metadata)
             
         Raises:
-            Exception: If download fails or video is too long
+            ValueError: If the video is too long
+            Exception: If download fails
+        """
+        info = None
+        metadata = self._cached_metadata(url)
+        
+        if metadata is None:
+            info, metadata = self._extract_info(url)
+        
+        # Check video duration before any heavy work
+        self._check_duration(metadata.duration)
+        
+        # Pin before touching the cache so a concurrent eviction can't remove
+        # the file between lookup/download and use
+        self.cache.pin(metadata.video_id)
+        try:
+            audio_file = self._cached_audio(metadata.video_id)
+            if audio_file is not None:
+                print(f"✅ Using cached audio: {audio_file.name}")
+                return audio_file, metadata
+            
+            if info is None:
+                info = self._recent_info(metadata.video_id)
+            if info is None:
+                info, metadata = self._extract_info(url)
+            
+            audio_file = self._download_with_info(info)
+            self.cache.add(metadata.video_id, audio_file)
+            return audio_file, metadata
+        except Exception:
+            self.cache.unpin(metadata.video_id)
+            raise
+    
+    def open_audio(self, url: str) -> "AudioSource":
+        """
+        Open a video's audio for transcription without waiting for the download
+        
+        Cached audio is returned as a file. Otherwise, with STREAMING_DOWNLOAD
+        enabled, the returned source decodes the stream while it downloads, so
+        transcription can start on the first windows right away.
+        
+        The audio is pinned in the cache until the source is released (use it
+        as a context manager or call release()).
+        
+        Args:
+            url: YouTube video URL
+            
+        Returns:
+            AudioSource for the video
+            
+        Raises:
+            ValueError: If the video is too long
+            Exception: If extraction or (non-streaming) download fails
+        """
+        if not STREAMING_DOWNLOAD:
+            audio_file, metadata = self.download_audio(url)
+            return AudioSource(self, metadata, audio_file=audio_file)
+        
+        info = None
+        metadata = self._cached_metadata(url)
+        if metadata is None:
+            info, metadata = self._extract_info(url)
+        
+        self._check_duration(metadata.duration)
+        
+        self.cache.pin(metadata.video_id)
+        try:
+            audio_file = self._cached_audio(metadata.video_id)
+            if audio_file is not None:
+                print(f"✅ Using cached audio: {audio_file.name}")
+                return AudioSource(self, metadata, audio_file=audio_file)
+            
+            if info is None:
+                info = self._recent_info(metadata.video_id)
+            if info is None:
+                info, metadata = self._extract_info(url)
+            return AudioSource(self, metadata, info=info)
+        except Exception:
+            self.cache.unpin(metadata.video_id)
+            raise
+    
+    def _stream_command(self, info: Dict, temp_file: Path, output_args: List[str]) -> List[str]:
+        """
+        Build an FFmpeg command that reads the remote stream once and writes
+        both the cache file and raw PCM for the transcriber
+        
+        Args:
+            info: yt-dlp info dict with the selected format's URL and headers
+            temp_file: Where to write the cached copy while downloading
+            output_args: Encoder arguments for the cached copy
+            
+        Returns:
+            FFmpeg command line
+        """
+        stream_url = info.get('url')
+        if not stream_url:
+            raise Exception("Selected format has no direct stream URL")
+        
+        headers = ''.join(f"{k}: {v}\r\n" for k, v in (info.get('http_headers') or {}).items())
+        cmd = ['ffmpeg', '-nostdin', '-v', 'error', '-y']
+        if stream_url.startswith('http'):
+            cmd += ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5']
+        if headers:
+            cmd += ['-headers', headers]
+        cmd += ['-i', stream_url, '-vn',
+                '-map', '0:a:0', *output_args, str(temp_file),
+                '-map', '0:a:0', *pcm_output_args(), 'pipe:1']
+        return cmd
+    
+    def _stream_download(self, source: "AudioSource", window_samples: int) -> Iterator[np.ndarray]:
+        """
+        Download a stream through FFmpeg, yielding PCM windows as they decode
+        
+        When the stream finishes, the cached copy is validated, moved into
+        place and registered with the audio cache (source.audio_file is set).
+        
+        Args:
+            source: AudioSource holding the extracted info dict
+            window_samples: Samples per yielded window
+            
+        Yields:
+            16 kHz mono float32 windows
         """
-        # Clean up old files before downloading new ones
-        self.cleanup_old_files()
+        info = source.info
+        if self.audio_format == 'native':
+            ext, args = info.get('ext') or 'webm', ['-c:a', 'copy']
+        else:
+            ext, args = CONVERSION_ARGS[self.audio_format]
         
-        # Try MP3 first, fallback to WAV if it fails
-        formats_to_try = [
-            ('mp3', AUDIO_BITRATE.replace('k', '')),
-            ('wav', '192')  # WAV as fallback
-        ]
+        temp_file = self._partial_path(info['id'], ext)
+        # Download and decode happen in one FFmpeg process, so its output
+        # time is the download time; wall time would include the pauses
+        # while the transcriber catches up
+        windows = decode_pipe(
+            self._stream_command(info, temp_file, args), window_samples,
+            record=DOWNLOAD_SECONDS.labels("stream").observe
+        )
+        start = time.perf_counter()
+        try:
+            print("Streaming audio download into the transcriber...")
+            first = True
+            for window in windows:
+                if first:
+                    DOWNLOAD_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - start)
+                    first = False
+                yield window
+            # FFmpeg doesn't report input bytes; the cache file may be re-encoded
+            source_size = info.get('filesize') or info.get('filesize_approx')
+            if source_size:
+                DOWNLOAD_BYTES.labels("stream").inc(source_size)
+            AUDIO_CACHE_WRITTEN_BYTES.labels("stream").inc(temp_file.stat().st_size)
+            
+            if temp_file.stat().st_size < 1024 or not self._validate_audio_file(temp_file):
+                raise Exception(f"Downloaded audio stream is corrupted or invalid: {temp_file.name}")
+            
+            audio_file = self._publish(temp_file, info['id'])
+            self.cache.add(info['id'], audio_file)
+            source.audio_file = audio_file
+            print(f"✅ Audio file saved and validated: {audio_file.name}")
+        finally:
+            windows.close()
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def _download_with_info(self, info: Dict) -> Path:
+        """
+        Download the native audio stream from an already-extracted info dict
+        and convert it if a specific AUDIO_FORMAT is configured
         
+        Args:
+            info: yt-dlp info dict from extract_info(download=False)
+            
+        Returns:
+            Path to the validated audio file
+            
+        Raises:
+            Exception: If the download fails
+        """
+        options = self._ydl_options()
+        # Private file name, so concurrent downloads of one video don't collide
+        options['outtmpl'] = str(self.download_dir / f"%(id)s.{uuid.uuid4().hex}.partial.%(ext)s")
+        start = time.perf_counter()
+        with yt_dlp.YoutubeDL(options) as ydl:
+            # Reuse the extracted page/player data instead of a second extraction
+            print("Downloading audio stream...")
+            result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+            downloads = result.get('requested_downloads') or [{}]
+            source_file = Path(downloads[0].get('filepath') or ydl.prepare_filename(result))
+        
+        if not source_file.exists():
+            raise FileNotFoundError(f"Downloaded audio file not found: {source_file}")
+        DOWNLOAD_SECONDS.labels("file").observe(time.perf_counter() - start)
+        DOWNLOAD_BYTES.labels("file").inc(source_file.stat().st_size)
+        
+        try:
+            # Validate the downloaded file
+            print(f"Validating audio file...")
+            if source_file.stat().st_size < 1024 or not self._validate_audio_file(source_file):
+                raise Exception(f"Downloaded audio stream is corrupted or invalid: {source_file.name}")
+            
+            # The decoder reads opus/m4a directly, so by default no transcode is needed
+            if self.audio_format == 'native':
+                audio_file = self._publish(source_file, info['id'])
+                print(f"✅ Audio stream saved and validated: {audio_file.name}")
+            else:
+                audio_file = self._convert(source_file, info['id'])
+            AUDIO_CACHE_WRITTEN_BYTES.labels("file").inc(audio_file.stat().st_size)
+            return audio_file
+        finally:
+            if source_file.exists():
+                source_file.unlink()
+    
+    def _partial_path(self, video_id: str, ext: str) -> Path:
+        """
+        Reserve a unique work-in-progress file in the download directory
+        
+        Every download and conversion writes its own file and only the final
+        rename (see _publish) touches the shared name, so concurrent runs for
+        the same video can't overwrite or delete each other's files.
+        """
+        fd, path = tempfile.mkstemp(dir=self.download_dir, prefix=f"{video_id}.", suffix=f".partial.{ext}")
+        os.close(fd)
+        return Path(path)
+    
+    def _publish(self, work_file: Path, video_id: str) -> Path:
+        """Atomically move a finished file to its cache name ({video_id}.{ext})"""
+        audio_file = self.download_dir / f"{video_id}{work_file.suffix}"
+        work_file.replace(audio_file)
+        return audio_file
+    
+    def _convert(self, source_file: Path, video_id: str) -> Path:
+        """
+        Convert a downloaded source stream, retrying only the conversion on failure
+        
+        Args:
+            source_file: Native audio stream from yt-dlp (a private partial file)
+            video_id: YouTube video ID, for the final file name
+            
+        Returns:
+            Converted file, or the source itself if every conversion fails
+        """
+        import subprocess
         last_error = None
         
-        for audio_format, quality in formats_to_try:
+        # Configured format first, 16 kHz PCM WAV as fallback
+        formats_to_try = [self.audio_format] + [f for f in ('pcm16k',) if f != self.audio_format]
+        
+        for audio_format in formats_to_try:
+            ext, args = CONVERSION_ARGS[audio_format]
+            temp_file = self._partial_path(video_id, ext)
+            
             try:
-                # Configure yt-dlp options
-                ydl_opts = {
-                    'format': 'bestaudio/best',
-                    'postprocessors': [{
-                        'key': 'FFmpegExtractAudio',
-                        'preferredcodec': audio_format,
-                        'preferredquality': quality,
-                    }],
-                    'outtmpl': str(self.download_dir / '%(id)s.%(ext)s'),
-                    'quiet': False,
-                    'no_warnings': False,
-                    # Additional options to bypass YouTube blocking
-                    'nocheckcertificate': True,
-                    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
-                    'prefer_ffmpeg': True,
-                }
+                print(f"Converting audio to {audio_format}...")
+                result = subprocess.run(
+                    ['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', str(source_file), '-vn',
+                     *args, str(temp_file)],
+                    capture_output=True,
+                    text=True
+                )
+                if result.returncode != 0:
+                    raise Exception(result.stderr.strip() or f"ffmpeg exited with {result.returncode}")
+                
+                if temp_file.stat().st_size < 1024 or not self._validate_audio_file(temp_file):
+                    raise Exception(f"Converted {audio_format} file is corrupted or invalid")
+                
+                audio_file = self._publish(temp_file, video_id)
+                source_file.unlink()
+                print(f"✅ Audio file saved and validated: {audio_file.name}")
+                return audio_file
                 
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    # Extract video info first
-                    info = ydl.extract_info(url, download=False)
-                    
-                    # Check video duration
-                    duration = info.get('duration', 0)
-                    if duration > MAX_VIDEO_DURATION:
-                        raise ValueError(
-                            f"Video duration ({duration}s) exceeds maximum allowed "
-                            f"({MAX_VIDEO_DURATION}s)"
-                        )
-                    
-                    # Create metadata
-                    metadata = VideoMetadata(
-                        title=info.get('title', 'Unknown'),
-                        duration=duration,
-                        channel=info.get('uploader', 'Unknown'),
-                        video_id=info.get('id', ''),
-                        url=url
-                    )
-                    
-                    # Download the audio
-                    print(f"Downloading audio as {audio_format.upper()}...")
-                    ydl.download([url])
-                    
-                    # Construct the output file path
-                    audio_file = self.download_dir / f"{info['id']}.{audio_format}"
-                    
-                    if not audio_file.exists():
-                        raise FileNotFoundError(f"Downloaded audio file not found: {audio_file}")
-                    
-                    # Validate the downloaded file
-                    print(f"Validating audio file...")
-                    if not self._validate_audio_file(audio_file):
-                        raise Exception(f"Downloaded {audio_format} file is corrupted or invalid")
-                    
-                    # Check file size (should be > 1KB)
-                    if audio_file.stat().st_size < 1024:
-                        raise Exception(f"Downloaded file is too small ({audio_file.stat().st_size} bytes)")
-                    
-                    print(f"✅ Audio file saved and validated: {audio_file.name}")
-                    return audio_file, metadata
-                    
             except Exception as e:
                 last_error = e
-                print(f"Failed to download as {audio_format}: {str(e)}")
-                if audio_format != formats_to_try[-1][0]:
-                    print(f"Trying fallback format...")
+                print(f"Failed to convert to {audio_format}: {str(e)}")
+                if temp_file.exists():
+                    temp_file.unlink()
                 continue
         
-        # If we get here, all formats failed
-        raise Exception(f"Failed to download audio in any format. Last error: {str(last_error)}")
+        # The source stream is still valid audio; hand it to the decoder as-is
+        print(f"Conversion failed ({str(last_error)}), using native stream: {source_file.name}")
+        return self._publish(source_file, video_id)
+
+
+class AudioSource:
+    """
+    Audio for one video: either a file already on disk, or a download that
+    is decoded while it streams in
+    """
+    
+    def __init__(
+        self,
+        downloader: YouTubeDownloader,
+        metadata: VideoMetadata,
+        audio_file: Optional[Path] = None,
+        info: Optional[Dict] = None
+    ):
+        self.downloader = downloader
+        self.metadata = metadata
+        self.audio_file = audio_file
+        self.info = info
+        self._released = False
+        
+    @property
+    def streaming(self) -> bool:
+        """Whether the audio still has to be downloaded"""
+        return self.audio_file is None
+        
+    def windows(self, window_samples: int) -> Iterator[np.ndarray]:
+        """
+        Yield 16 kHz mono float32 windows of the audio
+        
+        A streaming source that fails before producing any audio falls back
+        to a regular download, so an unusual format never breaks a request.
+        
+        Args:
+            window_samples: Samples per window
+            
+        Yields:
+            Decoded audio windows in order
+        """
+        if self.audio_file is not None:
+            yield from stream_audio(self.audio_file, window_samples)
+            return
+        
+        produced = False
+        try:
+            for window in self.downloader._stream_download(self, window_samples):
+                produced = True
+                yield window
+        except Exception as e:
+            if produced:
+                raise
+            print(f"Streaming download failed ({str(e)}), falling back to a full download")
+            self.audio_file = self.downloader._download_with_info(self.info)
+            self.downloader.cache.add(self.metadata.video_id, self.audio_file)
+            yield from stream_audio(self.audio_file, window_samples)
+        
+    def release(self) -> None:
+        """Release the audio cache pin (safe to call more than once)"""
+        if not self._released:
+            self._released = True
+            self.downloader.release_audio(self.metadata.video_id)
+        
+    def __enter__(self) -> "AudioSource":
+        return self
+        
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -0,0 +1,165 @@
+"""Extractive summarization: TF-IDF TextRank sentence scoring with NumPy"""
+
+import re
+from typing import Callable, List
+import numpy as np
+from app.config import MAX_SUMMARY_LENGTH
+from app.services.chunking import count_tokens, split_sentences
+
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Words too common to say anything about what a sentence is about
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been before being both but by
+can could did do does doing don't down during each few for from further had has have having he
+her here hers him his how i i'm if in into is it it's its just know like me more most my no nor
+not now of off on once only or other our out over own really right same she should so some such
+than that that's the their them then there these they thing things this those through to too
+um uh under until up very was we we're were what when where which while who why will with would
+yeah you you're your
+""".split())
+
+
+class ExtractiveSummarizer:
+    """
+    Picks the most central sentences of a text without an LLM
+
+    Sentences are TF-IDF vectors; TextRank runs on their cosine similarity
+    graph. The similarity matrix is never materialized: each power-iteration
+    step is two sparse products over (sentence, term) pairs, so a multi-hour
+    transcript ranks in milliseconds.
+    """
+
+    def __init__(self, damping: float = 0.85, iterations: int = 50, tolerance: float = 1e-6):
+        self.damping = damping
+        self.iterations = iterations
+        self.tolerance = tolerance
+
+    def rank(self, sentences: List[str]) -> np.ndarray:
+        """
+        Score sentences by centrality
+
+        Args:
+            sentences: Sentences in document order
+
+        Returns:
+            Array of scores, one per sentence (higher is more central)
+        """
+        n = len(sentences)
+        if n == 0:
+            return np.zeros(0)
+
+        # Sparse sentence-term matrix in COO form
+        vocab = {}
+        rows, cols = [], []
+        for i, sentence in enumerate(sentences):
+            for word in _WORD_PATTERN.findall(sentence.lower()):
+                if word not in STOPWORDS:
+                    rows.append(i)
+                    cols.append(vocab.setdefault(word, len(vocab)))
+        if not rows:
+            return np.full(n, 1.0 / n)
+
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        # Collapse repeated (sentence, term) pairs into term frequencies
+        pairs, tf = np.unique(rows * len(vocab) + cols, return_counts=True)
+        rows, cols = pairs // len(vocab), pairs % len(vocab)
+
+        df = np.bincount(cols, minlength=len(vocab))
+        values = tf * (np.log((1 + n) / (1 + df[cols])) + 1.0)
+        norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n))
+        values = values / norms[rows]
+        self_similarity = np.bincount(rows, weights=values ** 2, minlength=n)
+
+        def similarity_times(vector: np.ndarray) -> np.ndarray:
+            # (X X^T - diag) @ vector: similarity to every other sentence
+            by_term = np.bincount(cols, weights=values * vector[rows], minlength=len(vocab))
+            return np.bincount(rows, weights=values * by_term[cols], minlength=n) - self_similarity * vector
+
+        degree = similarity_times(np.ones(n))
+        connected = degree > 0
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.iterations):
+            share = np.where(connected, scores / np.where(connected, degree, 1.0), 0.0)
+            # Sentences with no similar sentence spread their score evenly
+            dangling = scores[~connected].sum() / n
+            updated = (1 - self.damping) / n + self.damping * (similarity_times(share) + dangling)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+        return scores
+
+    def compress(self, text: str, max_tokens: int) -> str:
+        """
+        Shorten text to a token budget by dropping the least central sentences
+
+        Args:
+            text: Text to compress (e.g. a transcript)
+            max_tokens: Token budget for the result
+
+        Returns:
+            Selected sentences in their original order, or the text unchanged
+            if it already fits
+        """
+        if count_tokens(text) <= max_tokens:
+            return text
+        return self._select(text, max_tokens, count_tokens)
+
+    def summarize(self, text: str, max_words: int = MAX_SUMMARY_LENGTH) -> str:
+        """
+        Build a summary from the most central sentences
+
+        Args:
+            text: Text to summarize
+            max_words: Word budget for the summary
+
+        Returns:
+            Summary text (sentences in their original order)
+        """
+        return self._select(text, max_words, lambda sentence: len(sentence.split()))
+
+    def _select(self, text: str, budget: int, cost: Callable[[str], int]) -> str:
+        """Keep the highest-ranked sentences that fit the budget, in document order"""
+        sentences = [
+            piece for sentence in split_sentences(text)
+            for piece in self._fit(sentence, budget, cost)
+        ]
+        if not sentences:
+            return ""
+        costs = np.array([cost(sentence) for sentence in sentences])
+        order = np.argsort(-self.rank(sentences), kind='stable')
+
+        keep = np.zeros(len(sentences), dtype=bool)
+        used = 0
+        for i in order:
+            if used + costs[i] <= budget:
+                keep[i] = True
+                used += costs[i]
+        if not keep.any():
+            # Not even one piece fits (a single word over budget); never return nothing
+            keep[order[0]] = True
+        return " ".join(sentence for sentence, kept in zip(sentences, keep) if kept)
+
+    def _fit(self, sentence: str, budget: int, cost: Callable[[str], int]) -> List[str]:
+        """
+        Split a sentence that exceeds the budget on its own at word boundaries
+
+        Unpunctuated transcripts come out of split_sentences() as one huge
+        "sentence"; its pieces are ranked like any other sentence.
+        """
+        if cost(sentence) <= budget:
+            return [sentence]
+        pieces, words, used = [], [], 0
+        for word in sentence.split():
+            word_cost = cost(word)
+            if words and used + word_cost > budget:
+                pieces.append(" ".join(words))
+                words, used = [], 0
+            words.append(word)
+            used += word_cost
+        if words:
+            pieces.append(" ".join(words))
+        return pieces
@@ -0,0 +1,178 @@
+"""Background job queue for summarization requests"""
+
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from app.config import JOB_MAX_WAITING, JOB_RETENTION_MINUTES
+from app.metrics import JOBS
+from app.models.schemas import JobResponse
+from app.services.pipeline import SummarizationPipeline
+from app.services.scheduler import BacklogFullError, Ticket
+
+
+# Pipeline event that starts each stage
+_STAGE_EVENTS = {
+    "metadata": "transcribing",
+    "transcript": "summarizing",
+}
+
+
+class Job:
+    """Mutable state of one job; read it through JobManager.get()"""
+
+    def __init__(self, url: str, mode: str):
+        self.job_id = uuid.uuid4().hex
+        self.url = url
+        self.mode = mode
+        self.status = "queued"
+        self.stage = None
+        self.progress = 0.0
+        self.message = "Waiting for a worker..."
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def to_response(self) -> JobResponse:
+        return JobResponse(
+            job_id=self.job_id,
+            status=self.status,
+            stage=self.stage,
+            progress=self.progress,
+            message=self.message,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error
+        )
+
+
+class JobManager:
+    """
+    Runs summarization jobs in the background
+
+    Submitting returns right after admission control, which reserves the
+    job's place in the pipeline's scheduler; the heavy work (download,
+    Whisper, LLM) happens on worker threads, so the API's event loop never
+    blocks on it. The scheduler decides the order (shortest video first) and
+    how many run (JOB_WORKERS). At most `workers` jobs are queued or running
+    at once, so every reserved place has a thread to claim it. Finished jobs are kept for
+    JOB_RETENTION_MINUTES so clients can poll their results.
+    """
+
+    def __init__(
+        self,
+        pipeline: SummarizationPipeline,
+        workers: int = JOB_MAX_WAITING,
+        retention_seconds: float = JOB_RETENTION_MINUTES * 60
+    ):
+        self.pipeline = pipeline
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        for status in ("queued", "running"):
+            JOBS.labels(status).set_function(lambda status=status: self._count(status))
+
+    def submit(self, url: str, mode: str = "abstractive") -> JobResponse:
+        """
+        Queue a video for summarization
+
+        Args:
+            url: YouTube video URL
+            mode: Summary mode ("abstractive" or "extractive")
+
+        Returns:
+            Initial job status (queued)
+
+        Raises:
+            ValueError: If the video is not allowed (e.g. too long)
+            BacklogFullError: If the server has too much work queued
+        """
+        job = Job(url, mode)
+        with self._lock:
+            self._prune()
+            active = sum(1 for j in self._jobs.values() if j.finished_at is None)
+            if active >= self.workers:
+                raise BacklogFullError(
+                    f"Server is busy: {active} jobs queued or running",
+                    max(1, math.ceil(self.pipeline.scheduler.backlog()))
+                )
+            # Hold the job's place while admission looks the video up
+            self._jobs[job.job_id] = job
+            response = job.to_response()
+        try:
+            ticket = self.pipeline.admit(url, mode)
+        except Exception:
+            with self._lock:
+                del self._jobs[job.job_id]
+            raise
+        self._executor.submit(self._run, job, ticket)
+        return response
+
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        """
+        Current status of a job
+
+        Args:
+            job_id: ID returned by submit()
+
+        Returns:
+            Job status, or None if the job is unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_response() if job is not None else None
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued jobs"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pipeline.scheduler.close()
+
+    def _run(self, job: Job, ticket: Ticket) -> None:
+        """Worker: run the pipeline and record progress as events arrive"""
+        try:
+            for event, data in self.pipeline.stream(job.url, mode=job.mode, ticket=ticket):
+                with self._lock:
+                    if event == "queued":
+                        job.message = f"⏳ Waiting for a worker (~{data / 60:.0f} min)..."
+                    elif event == "progress":
+                        if job.status == "queued":
+                            # First progress event: the scheduler gave us a worker
+                            job.status = "running"
+                            job.stage = "downloading"
+                            job.started_at = time.time()
+                        job.progress, job.message = data
+                    elif event in _STAGE_EVENTS:
+                        job.stage = _STAGE_EVENTS[event]
+                    elif event == "result":
+                        job.result = data
+            with self._lock:
+                job.status = "completed"
+                job.finished_at = time.time()
+        except Exception as e:
+            print(f"Job {job.job_id} failed: {str(e)}")
+            with self._lock:
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = time.time()
+
+    def _count(self, status: str) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == status)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention (caller holds the lock)"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,102 @@
+"""Persistent SQLite cache of video metadata"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from app.config import CACHE_DIR, METADATA_CACHE_TTL_HOURS
+from app.metrics import record_cache
+from app.models.schemas import VideoMetadata
+
+
+class MetadataCache:
+    """
+    Stores VideoMetadata by video ID with a time-to-live
+
+    Expired rows are purged when the cache opens and deleted when read.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = CACHE_DIR / "metadata.sqlite3",
+        ttl_seconds: float = METADATA_CACHE_TTL_HOURS * 3600
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS video_metadata (
+                    video_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+        purged = self.purge_expired()
+        if purged:
+            print(f"🧹 Purged {purged} expired metadata cache entries")
+
+    def get(self, video_id: str) -> Optional[VideoMetadata]:
+        """
+        Look up fresh metadata for a video
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Cached VideoMetadata, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fetched_at FROM video_metadata WHERE video_id = ?",
+                (video_id,)
+            ).fetchone()
+
+        if row is None:
+            record_cache("metadata", hit=False)
+            return None
+        data, fetched_at = row
+        if time.time() - fetched_at > self.ttl_seconds:
+            record_cache("metadata", hit=False)
+            with self._lock, self._conn:
+                # Only if it wasn't refreshed since we read it
+                self._conn.execute(
+                    "DELETE FROM video_metadata WHERE video_id = ? AND fetched_at = ?",
+                    (video_id, fetched_at)
+                )
+            return None
+        record_cache("metadata", hit=True)
+        return VideoMetadata.model_validate_json(data)
+
+    def set(self, metadata: VideoMetadata) -> None:
+        """
+        Store metadata for a video, replacing any previous entry
+
+        Args:
+            metadata: Metadata to cache
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_metadata (video_id, data, fetched_at) VALUES (?, ?, ?)",
+                (metadata.video_id, metadata.model_dump_json(), time.time())
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries
+
+        Returns:
+            Number of rows removed
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM video_metadata WHERE fetched_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+            return cursor.rowcount
+
+
+# Shared by every downloader in the process (one connection, serialized by a lock)
+metadata_cache = MetadataCache()
@@ -0,0 +1,151 @@
+"""Process-wide registry of loaded Whisper models"""
+
+import threading
+from typing import Dict, Optional, Tuple
+import whisper
+from app.config import WHISPER_MODEL, WHISPER_DEVICE, WHISPER_DTYPE
+
+
+ModelKey = Tuple[str, str, str]
+
+
+class WhisperModelRegistry:
+    """Loads each Whisper model once per process and shares it between callers"""
+
+    def __init__(self):
+        self._models: Dict[ModelKey, whisper.Whisper] = {}
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resolve_device(device: Optional[str] = None) -> str:
+        """
+        Resolve the device a model should run on
+
+        Args:
+            device: Requested device ("cpu", "cuda", ...); empty means auto-detect
+
+        Returns:
+            Concrete device name
+        """
+        device = device or WHISPER_DEVICE
+        if device:
+            return device
+
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @staticmethod
+    def resolve_dtype(device: str, dtype: Optional[str] = None) -> str:
+        """
+        Resolve the compute dtype for a device
+
+        Args:
+            device: Concrete device name
+            dtype: Requested dtype ("float32" or "float16")
+
+        Returns:
+            "float16" or "float32" (fp16 is not supported on CPU)
+        """
+        dtype = dtype or WHISPER_DTYPE
+        if device == "cpu":
+            return "float32"
+        return "float16" if dtype in ("float16", "fp16") else "float32"
+
+    def key_for(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> ModelKey:
+        """
+        Build the registry key for a model configuration
+
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            device: Requested device, empty for auto-detect
+            dtype: Requested dtype
+
+        Returns:
+            Tuple of (model_size, device, dtype)
+        """
+        device = self.resolve_device(device)
+        return (model_size or WHISPER_MODEL, device, self.resolve_dtype(device, dtype))
+
+    def get(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> whisper.Whisper:
+        """
+        Return a shared Whisper model, loading it on first use
+
+        Concurrent first callers for the same key wait for a single load
+        instead of each reading the weights from disk.
+
+        Args:
+            model_size: Whisper model size, defaults to WHISPER_MODEL
+            device: Device to load onto, defaults to WHISPER_DEVICE / auto
+            dtype: Compute dtype, defaults to WHISPER_DTYPE
+
+        Returns:
+            Loaded Whisper model
+        """
+        key = self.key_for(model_size, device, dtype)
+
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            model = self._models.get(key)
+            if model is None:
+                size, device, _ = key
+                print(f"Loading Whisper '{size}' model on {device} (this may take a moment on first run)...")
+                model = whisper.load_model(size, device=device)
+                self._models[key] = model
+                print("Whisper model loaded successfully!")
+
+        return model
+
+    def preload(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> None:
+        """
+        Load a model ahead of the first request (e.g. at application startup)
+
+        Args:
+            model_size: Whisper model size, defaults to WHISPER_MODEL
+            device: Device to load onto, defaults to WHISPER_DEVICE / auto
+            dtype: Compute dtype, defaults to WHISPER_DTYPE
+        """
+        self.get(model_size, device, dtype)
+
+    def is_loaded(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> bool:
+        """Check whether a model configuration is already in memory"""
+        return self.key_for(model_size, device, dtype) in self._models
+
+    def unload(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> None:
+        """Drop a model from the registry so its memory can be reclaimed"""
+        self._models.pop(self.key_for(model_size, device, dtype), None)
+
+
+# Shared by the FastAPI router, Gradio and Streamlit within one process
+model_registry = WhisperModelRegistry()
@@ -0,0 +1,204 @@
+"""Pooled HTTP clients for the Ollama API"""
+
+import json
+import threading
+import time
+from typing import Iterator, List, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_MAX_PARALLEL, OLLAMA_TAGS_TTL_SECONDS
+from app.metrics import record_generation
+
+
+# Generate calls are capped at OLLAMA_MAX_PARALLEL; leave room for tag lookups
+POOL_SIZE = OLLAMA_MAX_PARALLEL + 2
+
+
+def _has_model(model: str, model_names: List[str]) -> bool:
+    """Whether a model (e.g. 'llama3.1' or 'llama3.1:8b') is among installed names"""
+    return model in model_names or any(model in name for name in model_names)
+
+
+class ModelListCache:
+    """Remembers Ollama's installed models for a short time"""
+
+    def __init__(self, ttl_seconds: float = OLLAMA_TAGS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._names: Optional[List[str]] = None
+        self._fetched_at = 0.0
+
+    def get(self) -> Optional[List[str]]:
+        """Cached model names, or None if missing or expired"""
+        with self._lock:
+            if self._names is not None and time.monotonic() - self._fetched_at < self.ttl_seconds:
+                return self._names
+            return None
+
+    def set(self, names: List[str]) -> None:
+        """Store freshly fetched model names"""
+        with self._lock:
+            self._names = names
+            self._fetched_at = time.monotonic()
+
+
+def _generate_payload(model: str, prompt: str, options: dict, stream: bool) -> dict:
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+        "options": options
+    }
+    if OLLAMA_KEEP_ALIVE:
+        # Keep the model resident between our requests instead of paying for
+        # a reload after Ollama's default idle timeout
+        payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+    return payload
+
+
+class OllamaClient:
+    """
+    Synchronous Ollama client over one keep-alive connection pool
+
+    Safe to share between threads; every caller reuses pooled connections
+    instead of opening a new TCP connection per request.
+    """
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, models: Optional[ModelListCache] = None):
+        self.base_url = base_url.rstrip('/')
+        self.models = models or ModelListCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, model: str, prompt: str, options: dict, timeout: float = 300) -> str:
+        """
+        Run one non-streaming generation
+
+        Args:
+            model: Ollama model name
+            prompt: Prompt text
+            options: Ollama sampling options
+            timeout: Request timeout in seconds
+
+        Returns:
+            Generated text
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=_generate_payload(model, prompt, options, stream=False),
+            timeout=timeout
+        )
+        response.raise_for_status()
+        body = response.json()
+        record_generation(model, body)
+        return body.get('response', '').strip()
+
+    def generate_stream(self, model: str, prompt: str, options: dict, timeout: float = 300) -> Iterator[str]:
+        """
+        Run one generation, yielding tokens as Ollama produces them
+
+        Args:
+            model: Ollama model name
+            prompt: Prompt text
+            options: Ollama sampling options
+            timeout: Seconds to wait for each piece of the response
+
+        Yields:
+            Response text fragments, in order
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+            Exception: If Ollama reports an error mid-stream
+        """
+        with self.session.post(
+            f"{self.base_url}/api/generate",
+            json=_generate_payload(model, prompt, options, stream=True),
+            stream=True,
+            timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            # One JSON object per line until {"done": true}
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise Exception(f"Ollama error: {chunk['error']}")
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done'):
+                    # The final chunk carries the token counts and timings
+                    record_generation(model, chunk)
+                    break
+
+    def list_models(self) -> List[str]:
+        """
+        Names of installed models (cached for OLLAMA_TAGS_TTL_SECONDS)
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        names = self.models.get()
+        if names is None:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=10)
+            response.raise_for_status()
+            names = [m.get('name', '') for m in response.json().get('models', [])]
+            self.models.set(names)
+        return names
+
+    def has_model(self, model: str) -> bool:
+        """Whether a model is installed"""
+        return _has_model(model, self.list_models())
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
+
+
+class AsyncOllamaClient:
+    """Async Ollama client for the FastAPI event loop, with its own connection pool"""
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, models: Optional[ModelListCache] = None):
+        self.base_url = base_url.rstrip('/')
+        self.models = models or ModelListCache()
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            timeout=httpx.Timeout(300, connect=10)
+        )
+
+    async def list_models(self) -> List[str]:
+        """
+        Names of installed models (cached for OLLAMA_TAGS_TTL_SECONDS)
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        names = self.models.get()
+        if names is None:
+            response = await self.client.get("/api/tags", timeout=10)
+            response.raise_for_status()
+            names = [m.get('name', '') for m in response.json().get('models', [])]
+            self.models.set(names)
+        return names
+
+    async def has_model(self, model: str) -> bool:
+        """Whether a model is installed"""
+        return _has_model(model, await self.list_models())
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self.client.aclose()
+
+
+# Shared by every summarizer and route in the process; both clients share the
+# model list so a lookup by either serves the other
+_model_list = ModelListCache()
+ollama_client = OllamaClient(models=_model_list)
+async_ollama_client = AsyncOllamaClient(models=_model_list)
@@ -0,0 +1,296 @@
+"""End-to-end summarization pipeline shared by the API and UIs"""
+
+import time
+from typing import Any, Callable, Generator, Iterator, Optional, Tuple
+from app.metrics import PIPELINE_SECONDS
+from app.models.schemas import SummarizeResponse
+from app.services.downloader import YouTubeDownloader, extract_video_id
+from app.services.extractive import ExtractiveSummarizer
+from app.services.scheduler import JobScheduler, Ticket, job_scheduler
+from app.services.singleflight import SingleFlight
+from app.services.transcriber import AudioTranscriber
+from app.services.summarizer import TextSummarizer
+
+
+# progress(fraction, message), fraction in [0, 1]
+ProgressCallback = Callable[[float, str], None]
+
+# Shared by every pipeline in the process, so concurrent requests for the same
+# video from the API, jobs and UIs all attach to one run
+pipeline_flights = SingleFlight()
+
+
+class SummarizationPipeline:
+    """Runs download, transcription and summarization for one video"""
+
+    def __init__(
+        self,
+        downloader: Optional[YouTubeDownloader] = None,
+        transcriber: Optional[AudioTranscriber] = None,
+        summarizer: Optional[TextSummarizer] = None,
+        flights: SingleFlight = pipeline_flights,
+        scheduler: JobScheduler = job_scheduler
+    ):
+        self.downloader = downloader or YouTubeDownloader()
+        self.transcriber = transcriber or AudioTranscriber()
+        self.summarizer = summarizer or TextSummarizer()
+        self.extractive = ExtractiveSummarizer()
+        self.flights = flights
+        self.scheduler = scheduler
+
+    def run(
+        self,
+        url: str,
+        enable_diarization: bool = False,
+        num_speakers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        mode: str = "abstractive"
+    ) -> SummarizeResponse:
+        """
+        Summarize a YouTube video
+
+        Stages overlap: Whisper starts on the first audio windows while the
+        rest of the stream is still downloading, and long transcripts are
+        summarized section by section as they are transcribed.
+
+        Args:
+            url: YouTube video URL
+            enable_diarization: Whether to identify speakers
+            num_speakers: Expected number of speakers (optional hint)
+            progress: Optional callback for stage updates
+            mode: "abstractive" (LLM) or "extractive" (key sentences, no LLM)
+
+        Returns:
+            SummarizeResponse with metadata, transcript, segments and summary
+
+        Raises:
+            ValueError: If the video is not allowed (e.g. too long)
+            BacklogFullError: If the server has too much work queued
+            Exception: If any stage fails
+        """
+        for event, data in self.stream(url, enable_diarization, num_speakers, mode):
+            if event == "progress" and progress is not None:
+                progress(*data)
+            elif event == "result":
+                return data
+        raise Exception("Pipeline finished without a result")
+
+    def stream(
+        self,
+        url: str,
+        enable_diarization: bool = False,
+        num_speakers: Optional[int] = None,
+        mode: str = "abstractive",
+        ticket: Optional[Ticket] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Summarize a YouTube video, yielding events as each stage produces output
+
+        Events are (name, data) tuples:
+            queued: estimated seconds until a worker is free (only if waiting)
+            progress: (fraction, message) stage update
+            metadata: VideoMetadata, once the audio source is open
+            transcript: (transcript, segments), once transcription is done
+            token: next fragment of the summary text
+            result: final SummarizeResponse (always the last event)
+
+        Concurrent calls for the same video and options share one run: later
+        callers receive the events already produced, then follow along. Runs
+        wait for a worker in the scheduler, shortest video first.
+
+        Args:
+            url: YouTube video URL
+            enable_diarization: Whether to identify speakers
+            num_speakers: Expected number of speakers (optional hint)
+            mode: "abstractive" (LLM) or "extractive" (key sentences, no LLM)
+            ticket: Ticket from admit() to run under; released when the
+                stream ends (or right away if it joins an in-flight run)
+
+        Yields:
+            (event, data) tuples
+
+        Raises:
+            ValueError: If the video is not allowed (e.g. too long)
+            BacklogFullError: If the server has too much work queued
+            Exception: If any stage fails
+        """
+        # Canonical video ID, so youtu.be/..., watch?v=...&t=... etc. coalesce
+        key = (extract_video_id(url) or url, mode, enable_diarization, num_speakers)
+        if ticket is None:
+            return self.flights.stream(
+                key, lambda: self._stream(url, enable_diarization, num_speakers, mode)
+            )
+        return self._stream_with_ticket(key, url, enable_diarization, num_speakers, mode, ticket)
+
+    def admit(self, url: str, mode: str = "abstractive") -> Ticket:
+        """
+        Admit a video into the scheduler's queue ahead of running it
+
+        Reserving the place up front (rather than only checking) means work
+        accepted but not yet started counts toward the backlog limit.
+
+        Args:
+            url: YouTube video URL
+            mode: "abstractive" or "extractive"
+
+        Returns:
+            Ticket to pass to stream()
+
+        Raises:
+            ValueError: If the video is not allowed (e.g. too long)
+            BacklogFullError: If the server has too much work queued
+        """
+        metadata = self.downloader.get_metadata(url)
+        return self.scheduler.submit(metadata.duration, mode)
+
+    def _stream_with_ticket(
+        self,
+        key: Tuple,
+        url: str,
+        enable_diarization: bool,
+        num_speakers: Optional[int],
+        mode: str,
+        ticket: Ticket
+    ) -> Iterator[Tuple[str, Any]]:
+        """stream() under an admitted ticket, releasing it if the run isn't ours"""
+        started = False
+
+        def start() -> Iterator[Tuple[str, Any]]:
+            nonlocal started
+            started = True
+            return self._stream(url, enable_diarization, num_speakers, mode, ticket)
+
+        released = False
+        try:
+            for event in self.flights.stream(key, start):
+                if not started and not released:
+                    # Joined someone else's run; give our place back
+                    self.scheduler.finish(ticket, observe=False)
+                    released = True
+                yield event
+        finally:
+            if not started and not released:
+                self.scheduler.finish(ticket, observe=False)
+
+    def _stream(
+        self,
+        url: str,
+        enable_diarization: bool,
+        num_speakers: Optional[int],
+        mode: str,
+        ticket: Optional[Ticket] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """Wait for a worker, then run the stages; see stream() for the events"""
+        if ticket is None:
+            ticket = self.admit(url, mode)
+        success = False
+        transcribed = False
+        try:
+            wait = self.scheduler.estimated_wait(ticket)
+            if wait > 0:
+                yield "queued", wait
+            self.scheduler.wait(ticket)
+
+            transcribed = yield from self._run_stages(url, enable_diarization, num_speakers, mode)
+            success = True
+        finally:
+            # Cache hits finish in seconds and would drag the estimate for
+            # every new video of that length down with them
+            self.scheduler.finish(ticket, observe=success and transcribed)
+            if ticket.started_at is not None:
+                PIPELINE_SECONDS.labels(mode, "completed" if success else "failed").observe(
+                    time.monotonic() - ticket.started_at
+                )
+
+    def _run_stages(
+        self,
+        url: str,
+        enable_diarization: bool,
+        num_speakers: Optional[int],
+        mode: str
+    ) -> Generator[Tuple[str, Any], None, bool]:
+        """
+        Run download, transcription and summarization for one video
+
+        Returns:
+            Whether Whisper ran (False if the transcript came from the cache)
+        """
+        start_time = time.time()
+        cache_hits = []
+
+        yield "progress", (0.1, "📥 Downloading audio...")
+        # Section summaries of long transcripts are generated while later
+        # audio is still being transcribed; only the final combine waits
+        extractive = mode == "extractive"
+        incremental = None if extractive else self.summarizer.start_incremental()
+        summarized = False
+        try:
+            cached = None
+            if not enable_diarization:
+                # Speaker labels need the audio; otherwise a cached transcript
+                # means there is nothing to download
+                metadata = self.downloader.get_metadata(url)
+                cached = self.transcriber.cached_transcript(metadata.video_id)
+
+            if cached is not None:
+                print("Transcript cache hit, skipping download and transcription")
+                yield "metadata", metadata
+                transcript, segments = cached
+                cache_hits.append(True)
+                if incremental:
+                    incremental.feed(transcript)
+            else:
+                with self.downloader.open_audio(url) as source:
+                    metadata = source.metadata
+                    yield "metadata", metadata
+
+                    message = "🎤 Transcribing audio"
+                    if source.streaming:
+                        message += " while downloading"
+                    if enable_diarization:
+                        message += " & identifying speakers"
+                    yield "progress", (0.3, message + "...")
+
+                    transcript, segments = self.transcriber.transcribe_source(
+                        source, enable_diarization, num_speakers,
+                        on_text=incremental.feed if incremental else None,
+                        on_cache_hit=lambda: cache_hits.append(True)
+                    )
+
+            yield "transcript", (transcript, segments)
+
+            if extractive:
+                # Milliseconds, no LLM: for triage of large batches
+                yield "progress", (0.6, "📝 Extracting key sentences...")
+                summary = self.extractive.summarize(transcript, self.summarizer.max_summary_length)
+                yield "token", summary
+            else:
+                yield "progress", (0.6, "📝 Generating summary...")
+
+                # Tokens of the final generation reach the caller as Ollama emits them
+                parts = []
+                for token in incremental.stream():
+                    parts.append(token)
+                    yield "token", token
+                summarized = True
+                summary = "".join(parts).strip()
+            if not summary:
+                raise Exception("Summarization failed: Empty summary received from model")
+
+            yield "progress", (1.0, "✅ Complete!")
+
+            yield "result", SummarizeResponse(
+                metadata=metadata,
+                transcript=transcript,
+                segments=segments,
+                summary=summary,
+                processing_time=time.time() - start_time,
+                transcript_word_count=len(transcript.split()),
+                summary_word_count=len(summary.split())
+            )
+        finally:
+            # Failed, or closed early (client gone, run abandoned): stop the
+            # map calls still queued for Ollama
+            if incremental and not summarized:
+                incremental.cancel()
+        return not cache_hits
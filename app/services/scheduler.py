@@ -0,0 +1,253 @@
+"""Duration-aware scheduling and admission control for pipeline runs"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config import (
+    JOB_WORKERS, SCHEDULER_MAX_BACKLOG_MINUTES, SCHEDULER_AGING,
+    SCHEDULER_INITIAL_RTF, SCHEDULER_RTF_ALPHA
+)
+from app import metrics
+
+
+# Floor for cost estimates, so unknown (0 s) durations aren't treated as free
+_MIN_DURATION = 30
+
+
+class BacklogFullError(Exception):
+    """Raised when the estimated backlog is over the limit; retry after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CostModel:
+    """
+    Estimates processing time from video duration
+
+    Keeps an exponentially weighted moving average of the measured real-time
+    factor (processing seconds per second of video) for each summary mode.
+    """
+
+    def __init__(self, initial_rtf: float = SCHEDULER_INITIAL_RTF, alpha: float = SCHEDULER_RTF_ALPHA):
+        self.initial_rtf = initial_rtf
+        self.alpha = alpha
+        self._rtf: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def real_time_factor(self, mode: str) -> float:
+        with self._lock:
+            return self._rtf.get(mode, self.initial_rtf)
+
+    def estimate(self, duration: int, mode: str) -> float:
+        """Estimated processing seconds for a video of this duration"""
+        return max(duration, _MIN_DURATION) * self.real_time_factor(mode)
+
+    def observe(self, duration: int, elapsed: float, mode: str) -> None:
+        """Fold one measured run into the average"""
+        rtf = elapsed / max(duration, _MIN_DURATION)
+        with self._lock:
+            previous = self._rtf.get(mode, self.initial_rtf)
+            self._rtf[mode] = previous + self.alpha * (rtf - previous)
+
+
+class Ticket:
+    """One admitted run, waiting for or holding a slot"""
+
+    def __init__(self, duration: int, mode: str, cost: float, submitted_at: float, priority: float):
+        self.duration = duration
+        self.mode = mode
+        self.cost = cost
+        self.submitted_at = submitted_at
+        self.priority = priority
+        self.started_at: Optional[float] = None
+
+
+class JobScheduler:
+    """
+    Runs at most `slots` pipelines at once, shortest estimated job first
+
+    Waiting runs are ordered by estimated cost minus `aging` times the time
+    they have waited, so short clips overtake a long lecture but the lecture
+    still starts eventually. Because every waiting run ages at the same rate,
+    that order is fixed at admission (cost + aging * enqueue time) and a heap
+    suffices.
+
+    New runs are rejected with BacklogFullError while the estimated wait for
+    a slot exceeds max_backlog_seconds (0 disables the limit).
+    """
+
+    def __init__(
+        self,
+        slots: int = JOB_WORKERS,
+        max_backlog_seconds: float = SCHEDULER_MAX_BACKLOG_MINUTES * 60,
+        aging: float = SCHEDULER_AGING,
+        cost_model: Optional[CostModel] = None
+    ):
+        self.slots = slots
+        self.max_backlog_seconds = max_backlog_seconds
+        self.aging = aging
+        self.cost_model = cost_model or CostModel()
+        self._waiting: List[Tuple[float, int, Ticket]] = []
+        self._running: List[Ticket] = []
+        self._order = itertools.count()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def check(self) -> None:
+        """
+        Check that new runs would be admitted right now
+
+        Raises:
+            BacklogFullError: If the backlog is over the limit
+        """
+        with self._cond:
+            self._check_backlog()
+
+    def submit(self, duration: int, mode: str, enforce_limit: bool = True) -> Ticket:
+        """
+        Admit a run and queue it for a slot
+
+        Args:
+            duration: Video duration in seconds
+            mode: Summary mode
+            enforce_limit: Reject the run if the backlog is over the limit;
+                False queues it regardless (for work already accepted, e.g.
+                the rest of a batch)
+
+        Returns:
+            Ticket to pass to wait() and finish()
+
+        Raises:
+            BacklogFullError: If the backlog is over the limit
+        """
+        cost = self.cost_model.estimate(duration, mode)
+        with self._cond:
+            if enforce_limit:
+                self._check_backlog()
+            elif self._closed:
+                raise Exception("Scheduler is shutting down")
+            now = time.monotonic()
+            ticket = Ticket(duration, mode, cost, now, cost + self.aging * now)
+            heapq.heappush(self._waiting, (ticket.priority, next(self._order), ticket))
+            self._cond.notify_all()
+        return ticket
+
+    def estimated_wait(self, ticket: Ticket) -> float:
+        """Estimated seconds until a waiting ticket gets a slot"""
+        with self._cond:
+            if ticket.started_at is not None:
+                return 0.0
+            ahead = sum(t.cost for _, _, t in self._waiting if t.priority < ticket.priority)
+            if len(self._running) < self.slots and not ahead:
+                return 0.0
+            return (self._remaining() + ahead) / self.slots
+
+    def wait(self, ticket: Ticket) -> None:
+        """
+        Block until the ticket holds a slot
+
+        Raises:
+            Exception: If the scheduler is closed while waiting
+        """
+        with self._cond:
+            while not (
+                len(self._running) < self.slots and self._waiting[0][2] is ticket
+            ):
+                if self._closed:
+                    self._remove(ticket)
+                    raise Exception("Scheduler is shutting down")
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            ticket.started_at = time.monotonic()
+            self._running.append(ticket)
+            self._cond.notify_all()
+        metrics.SCHEDULER_WAIT_SECONDS.observe(ticket.started_at - ticket.submitted_at)
+
+    def finish(self, ticket: Ticket, observe: bool = True) -> None:
+        """
+        Release the ticket's slot (or its place in the queue)
+
+        Args:
+            ticket: Ticket from submit()
+            observe: Whether the run's elapsed time is representative (it
+                completed and did the full work, e.g. no transcript cache
+                hit); only those runs update the real-time factor estimate
+        """
+        with self._cond:
+            if ticket in self._running:
+                self._running.remove(ticket)
+            else:
+                self._remove(ticket)
+            self._cond.notify_all()
+        if observe and ticket.started_at is not None:
+            elapsed = time.monotonic() - ticket.started_at
+            self.cost_model.observe(ticket.duration, elapsed, ticket.mode)
+
+    @property
+    def waiting(self) -> int:
+        """Number of runs waiting for a slot"""
+        with self._cond:
+            return len(self._waiting)
+
+    @property
+    def running(self) -> int:
+        """Number of runs holding a slot"""
+        with self._cond:
+            return len(self._running)
+
+    def backlog(self) -> float:
+        """Estimated seconds of queued and remaining work per slot"""
+        with self._cond:
+            return self._backlog()
+
+    def close(self) -> None:
+        """Fail every waiting run (e.g. at shutdown)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _remaining(self) -> float:
+        now = time.monotonic()
+        return sum(max(t.cost - (now - t.started_at), 0.0) for t in self._running)
+
+    def _backlog(self) -> float:
+        queued = sum(t.cost for _, _, t in self._waiting)
+        return (self._remaining() + queued) / self.slots
+
+    def _check_backlog(self) -> None:
+        if self._closed:
+            raise Exception("Scheduler is shutting down")
+        if self.max_backlog_seconds <= 0:
+            return
+        backlog = self._backlog()
+        if backlog > self.max_backlog_seconds:
+            retry_after = max(1, math.ceil(backlog - self.max_backlog_seconds))
+            metrics.SCHEDULER_REJECTED.inc()
+            raise BacklogFullError(
+                f"Server is busy: about {backlog / 60:.0f} min of work queued "
+                f"(limit {self.max_backlog_seconds / 60:.0f} min)",
+                retry_after
+            )
+
+    def _remove(self, ticket: Ticket) -> None:
+        remaining = [entry for entry in self._waiting if entry[2] is not ticket]
+        if len(remaining) != len(self._waiting):
+            self._waiting = remaining
+            heapq.heapify(self._waiting)
+
+
+# Shared by every pipeline in the process
+job_scheduler = JobScheduler()
+
+metrics.SCHEDULER_WAITING.set_function(lambda: job_scheduler.waiting)
+metrics.SCHEDULER_RUNNING.set_function(lambda: job_scheduler.running)
+metrics.SCHEDULER_BACKLOG_SECONDS.set_function(job_scheduler.backlog)
+for _mode in ("abstractive", "extractive"):
+    metrics.SCHEDULER_REAL_TIME_FACTOR.labels(_mode).set_function(
+        lambda mode=_mode: job_scheduler.cost_model.real_time_factor(mode)
+    )
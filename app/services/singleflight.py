@@ -0,0 +1,120 @@
+"""Coalescing of concurrent identical work into one shared run"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+
+class _Flight:
+    """One in-flight run whose events are replayed to every subscriber"""
+
+    def __init__(self):
+        self.subscribers = 0
+        self._events: List[Any] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    def publish(self, event: Any) -> None:
+        with self._cond:
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def events(self) -> Iterator[Any]:
+        """All events from the start of the run, then new ones as they arrive"""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self._events) and not self._done:
+                    self._cond.wait()
+                if index < len(self._events):
+                    event = self._events[index]
+                    index += 1
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield event
+
+
+class SingleFlight:
+    """
+    Runs at most one event stream per key at a time
+
+    The first caller for a key starts the stream on a background thread;
+    callers arriving while it runs attach to it instead of starting their
+    own, and every subscriber sees the full event sequence (including events
+    published before it joined) and the same result or error. The run is
+    abandoned if all subscribers leave before it finishes.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def stream(self, key: Hashable, start: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """
+        Subscribe to the in-flight stream for a key, starting it if needed
+
+        Args:
+            key: Identifies identical work (e.g. video ID and options)
+            start: Creates the event iterator; only called by the first caller
+
+        Yields:
+            Events of the shared run, in order
+
+        Raises:
+            Exception: Whatever the shared run raised
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                threading.Thread(
+                    target=self._run, args=(key, flight, start), daemon=True,
+                    name="singleflight"
+                ).start()
+            else:
+                print(f"Joining in-flight request for {key}")
+            flight.subscribers += 1
+
+        try:
+            yield from flight.events()
+        finally:
+            with self._lock:
+                flight.subscribers -= 1
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a run for this key is currently in progress"""
+        with self._lock:
+            return key in self._flights
+
+    def _run(self, key: Hashable, flight: _Flight, start: Callable[[], Iterator[Any]]) -> None:
+        """Background thread: drive the stream and publish its events"""
+        error = None
+        events = None
+        try:
+            events = start()
+            for event in events:
+                flight.publish(event)
+                with self._lock:
+                    if flight.subscribers == 0:
+                        # Everyone left; stop here and let the next caller start fresh
+                        del self._flights[key]
+                        error = Exception("Request abandoned by all clients")
+                        return
+        except BaseException as e:
+            error = e
+        finally:
+            if events is not None and hasattr(events, "close"):
+                events.close()
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.finish(error)
@@ -1,18 +1,72 @@
 """Text summarization using Ollama LLM"""
 
+import threading
 import requests
-from typing import List
-from app.config import OLLAMA_BASE_URL, SUMMARIZATION_MODEL, MAX_SUMMARY_LENGTH, CHUNK_OVERLAP
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from app.config import (
+    SUMMARIZATION_MODEL, OLLAMA_MAX_PARALLEL, OLLAMA_NUM_CTX, MAX_SUMMARY_LENGTH, CHUNK_OVERLAP,
+    LLM_CACHE_ENABLED, EXTRACTIVE_COMPRESSION, EXTRACTIVE_TARGET_TOKENS
+)
+from app.services.cache import ResponseCache, response_cache
+from app.services.chunking import TextChunker, chunk_text, count_tokens
+from app.services.extractive import ExtractiveSummarizer
+from app.services.ollama_client import OllamaClient, ollama_client
+
+
+# Caps in-flight generate requests across all summaries in the process, so
+# concurrent jobs can't queue more work on Ollama than it has slots for
+_ollama_slots = threading.BoundedSemaphore(OLLAMA_MAX_PARALLEL)
 
 
 class TextSummarizer:
     """Summarizes text using Ollama LLM with thinking capabilities"""
     
-    def __init__(self):
-        self.ollama_url = f"{OLLAMA_BASE_URL}/api/generate"
+    # Output budget per section summary, in tokens
+    map_output_tokens = 512
+    
+    def __init__(
+        self,
+        client: Optional[OllamaClient] = None,
+        num_ctx: Optional[int] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        # Shared pooled client: connections are reused across requests
+        self.client = client or ollama_client
+        # Responses are cached per prompt, so a retried job only regenerates
+        # the chunk summaries it doesn't have yet
+        self.cache = cache or (response_cache if LLM_CACHE_ENABLED else None)
         self.model = SUMMARIZATION_MODEL
         self.max_summary_length = MAX_SUMMARY_LENGTH
         
+        # Every request must fit the context window: prompt + content + output.
+        # Text that fits in one request is summarized directly, longer text is
+        # split into the largest sentence-aligned chunks that fit.
+        self.num_ctx = num_ctx or OLLAMA_NUM_CTX
+        self.summary_output_tokens = self.max_summary_length * 2  # ~1.3 tokens per word, plus headroom
+        self.single_pass_max_tokens = (
+            self.num_ctx - count_tokens(self._single_request("")[0]) - self.summary_output_tokens
+        )
+        self.map_chunk_tokens = (
+            self.num_ctx - count_tokens(self._map_request("")[0]) - self.map_output_tokens
+        )
+        # Room for section summaries in the final and intermediate reduce prompts
+        self.reduce_input_max_tokens = (
+            self.num_ctx - count_tokens(self._reduce_request([])[0]) - self.summary_output_tokens
+        )
+        self.merge_input_max_tokens = (
+            self.num_ctx - count_tokens(self._merge_request([])[0]) - self.map_output_tokens
+        )
+        if min(self.single_pass_max_tokens, self.map_chunk_tokens) < 2 * CHUNK_OVERLAP:
+            raise Exception(
+                f"Context window of {self.num_ctx} tokens is too small for the "
+                f"summary prompts; increase OLLAMA_NUM_CTX"
+            )
+        
+        # Optional extractive pass that trims long text before any LLM call
+        self.compressor = ExtractiveSummarizer() if EXTRACTIVE_COMPRESSION else None
+        self.compression_target = EXTRACTIVE_TARGET_TOKENS or self.single_pass_max_tokens
+        
     def summarize(self, text: str) -> str:
         """
         Generate a summary of the given text
@@ -27,11 +81,10 @@ class TextSummarizer:
             Exception: If summarization fails
         """
         try:
-            # Count words
-            word_count = len(text.split())
+            text = self._compress(text)
             
-            # For very long transcripts, use chunking strategy
-            if word_count > 3000:
+            # For transcripts that don't fit the context window, use chunking strategy
+            if count_tokens(text) > self.single_pass_max_tokens:
                 return self._summarize_chunked(text)
             else:
                 return self._summarize_single(text)
@@ -49,6 +102,88 @@ class TextSummarizer:
         Returns:
             Summary text
         """
+        prompt, options = self._single_request(text)
+        
+        try:
+            summary = self._generate(prompt, options)
+            
+            if not summary:
+                raise Exception("Empty summary received from model")
+            
+            return summary
+            
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to communicate with Ollama: {str(e)}")
+    
+    def _summarize_chunked(self, text: str) -> str:
+        """
+        Summarize long text using map-reduce strategy
+        
+        Args:
+            text: Long text to summarize
+            
+        Returns:
+            Combined summary
+        """
+        return self._combine_summaries(self._map_chunks(text))
+    
+    def start_incremental(self) -> "IncrementalSummary":
+        """
+        Start a summary that is fed transcript text while it is produced
+        
+        Returns:
+            IncrementalSummary; call feed() with each transcript chunk and
+            result() once the transcript is complete
+        """
+        return IncrementalSummary(self)
+    
+    def _compress(self, text: str) -> str:
+        """
+        Apply extractive compression if enabled and the text is over target
+        
+        Args:
+            text: Text to summarize
+            
+        Returns:
+            The text, or its most central sentences within compression_target tokens
+        """
+        if self.compressor is None:
+            return text
+        tokens = count_tokens(text)
+        if tokens <= self.compression_target:
+            return text
+        compressed = self.compressor.compress(text, self.compression_target)
+        print(f"Extractive compression: ~{tokens} -> ~{count_tokens(compressed)} tokens")
+        return compressed
+    
+    def _final_request(self, text: str) -> Tuple[str, dict]:
+        """
+        Prompt and options for the generation that produces the summary
+        
+        Compresses the text if enabled, then builds a single-pass request, or
+        runs the map phase and builds the reduce request for long text.
+        
+        Args:
+            text: Text to summarize
+            
+        Returns:
+            Tuple of (prompt, options)
+        """
+        text = self._compress(text)
+        if count_tokens(text) > self.single_pass_max_tokens:
+            return self._reduce_request(self._map_chunks(text))
+        return self._single_request(text)
+    
+    def _single_request(self, text: str) -> Tuple[str, dict]:
+        """
+        Prompt and options for summarizing text in a single request
+        
+        Args:
+            text: Text to summarize
+            
+        Returns:
+            Tuple of (prompt, options)
+        """
         prompt = f"""You are an expert content summarizer. Create a concise, well-structured summary of the following content.
 
 **Content:**
@@ -64,77 +199,153 @@ class TextSummarizer:
 
 **Summary:**"""
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.3,
-                "top_p": 0.9,
-            }
+        options = {
+            "temperature": 0.3,
+            "top_p": 0.9,
+            "num_ctx": self.num_ctx,
+            "num_predict": self.summary_output_tokens,
         }
+        return prompt, options
+    
+    def _map_chunks(self, text: str) -> List[str]:
+        """
+        Map phase: summarize overlapping chunks of a long text
         
-        try:
-            response = requests.post(self.ollama_url, json=payload, timeout=300)
-            response.raise_for_status()
-            
-            result = response.json()
-            summary = result.get('response', '').strip()
-            
-            if not summary:
-                raise Exception("Empty summary received from model")
-            
-            return summary
+        Args:
+            text: Long text to summarize
             
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Failed to communicate with Ollama: {str(e)}")
+        Returns:
+            Section summaries in chunk order
+        """
+        chunks = chunk_text(text, self.map_chunk_tokens, CHUNK_OVERLAP)
+        
+        print(f"Text is long (~{count_tokens(text)} tokens), processing in {len(chunks)} chunks...")
+        
+        # Summarize chunks concurrently; map() keeps the results in chunk order
+        workers = min(OLLAMA_MAX_PARALLEL, len(chunks))
+        print(f"Summarizing {len(chunks)} chunks, up to {workers} at a time...")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary-map") as executor:
+            return list(executor.map(self._summarize_chunk, chunks))
     
-    def _summarize_chunked(self, text: str) -> str:
+    def _generate(self, prompt: str, options: dict) -> str:
         """
-        Summarize long text using map-reduce strategy
+        Run one non-streaming Ollama generation, served from the response
+        cache when the same prompt was answered before
         
         Args:
-            text: Long text to summarize
+            prompt: Prompt text
+            options: Ollama sampling options
             
         Returns:
-            Combined summary
+            Generated text
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(self.model, options, prompt)
+            cached = self.cache.get_response(cache_key)
+            if cached is not None:
+                return cached
+        
+        with _ollama_slots:
+            response = self.client.generate(self.model, prompt, options)
+        
+        if cache_key is not None and response:
+            self.cache.set_response(cache_key, response)
+        return response
+    
+    def _generate_stream(self, prompt: str, options: dict) -> Iterator[str]:
         """
-        # Split text into chunks
-        words = text.split()
-        chunk_size = 2000
-        chunks = []
+        Run one streaming Ollama generation
         
-        for i in range(0, len(words), chunk_size - CHUNK_OVERLAP):
-            chunk = ' '.join(words[i:i + chunk_size])
-            chunks.append(chunk)
+        A cached response is yielded in one piece; a fresh one is cached once
+        the stream has completed.
         
-        print(f"Text is long ({len(words)} words), processing in {len(chunks)} chunks...")
+        Args:
+            prompt: Prompt text
+            options: Ollama sampling options
+            
+        Yields:
+            Generated text fragments
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(self.model, options, prompt)
+            cached = self.cache.get_response(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        parts = []
+        with _ollama_slots:
+            for token in self.client.generate_stream(self.model, prompt, options):
+                parts.append(token)
+                yield token
+        
+        response = "".join(parts).strip()
+        if cache_key is not None and response:
+            self.cache.set_response(cache_key, response)
+    
+    def _summarize_chunk(self, chunk: str) -> str:
+        """
+        Map step: summarize one section of a long text
+        
+        Args:
+            chunk: Section text
+            
+        Returns:
+            Section summary
+        """
+        return self._generate(*self._map_request(chunk))
+    
+    def _map_request(self, chunk: str) -> Tuple[str, dict]:
+        """
+        Prompt and options for the map step
         
-        # Summarize each chunk
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            print(f"Summarizing chunk {i}/{len(chunks)}...")
+        Args:
+            chunk: Section text
             
-            chunk_prompt = f"""Summarize the following content section concisely, capturing the key points:
+        Returns:
+            Tuple of (prompt, options)
+        """
+        chunk_prompt = f"""Summarize the following content section concisely, capturing the key points:
 
 {chunk}
 
 Summary:"""
+        
+        options = {
+            "temperature": 0.3,
+            "num_ctx": self.num_ctx,
+            "num_predict": self.map_output_tokens,
+        }
+        return chunk_prompt, options
+    
+    def _combine_summaries(self, chunk_summaries: List[str]) -> str:
+        """
+        Reduce step: combine section summaries into the final summary
+        
+        Args:
+            chunk_summaries: Section summaries in order
             
-            payload = {
-                "model": self.model,
-                "prompt": chunk_prompt,
-                "stream": False,
-                "options": {"temperature": 0.3}
-            }
-            
-            response = requests.post(self.ollama_url, json=payload, timeout=300)
-            response.raise_for_status()
-            chunk_summary = response.json().get('response', '').strip()
-            chunk_summaries.append(chunk_summary)
+        Returns:
+            Final summary
+        """
+        return self._generate(*self._reduce_request(chunk_summaries))
+    
+    def _reduce_request(self, chunk_summaries: List[str]) -> Tuple[str, dict]:
+        """
+        Prompt and options for the final reduce step
+        
+        If the section summaries together don't fit the context window, they
+        are first collapsed level by level (see _collapse_summaries).
         
-        # Combine chunk summaries into final summary
-        combined = "\n\n".join(chunk_summaries)
+        Args:
+            chunk_summaries: Section summaries in order
+            
+        Returns:
+            Tuple of (prompt, options)
+        """
+        combined = "\n\n".join(self._collapse_summaries(chunk_summaries))
         
         final_prompt = f"""Synthesize these section summaries into a cohesive, comprehensive summary:
 
@@ -148,36 +359,217 @@ Summary:"""
 
 **Final Summary:**"""
 
-        payload = {
-            "model": self.model,
-            "prompt": final_prompt,
-            "stream": False,
-            "options": {"temperature": 0.3}
+        options = {
+            "temperature": 0.3,
+            "num_ctx": self.num_ctx,
+            "num_predict": self.summary_output_tokens,
         }
+        return final_prompt, options
+    
+    def _collapse_summaries(self, summaries: List[str]) -> List[str]:
+        """
+        Tree reduce: merge summaries until they fit one final reduce request
         
-        response = requests.post(self.ollama_url, json=payload, timeout=300)
-        response.raise_for_status()
-        final_summary = response.json().get('response', '').strip()
+        Each level packs consecutive summaries into context-sized batches and
+        summarizes the batches in parallel, so the number of levels grows
+        logarithmically with the transcript length.
         
-        return final_summary
+        Args:
+            summaries: Section summaries in order
+            
+        Returns:
+            Summaries in order whose combined size fits the final reduce prompt
+        """
+        level = 1
+        while len(summaries) > 1 and count_tokens("\n\n".join(summaries)) > self.reduce_input_max_tokens:
+            batches = self._batch_summaries(summaries)
+            if len(batches) == len(summaries):
+                break  # Nothing can be merged further
+            
+            print(f"Reduce level {level}: merging {len(summaries)} summaries in {len(batches)} groups...")
+            workers = min(OLLAMA_MAX_PARALLEL, len(batches))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary-reduce") as executor:
+                summaries = list(executor.map(self._merge_batch, batches))
+            level += 1
+        return summaries
+    
+    def _batch_summaries(self, summaries: List[str]) -> List[List[str]]:
+        """Group consecutive summaries into batches that fit one merge request"""
+        batches, batch, tokens = [], [], 0
+        for summary in summaries:
+            summary_tokens = count_tokens(summary) + 1  # plus separator
+            if batch and tokens + summary_tokens > self.merge_input_max_tokens:
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(summary)
+            tokens += summary_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _merge_batch(self, batch: List[str]) -> str:
+        """
+        Intermediate reduce: summarize a group of consecutive section summaries
+        
+        Args:
+            batch: Section summaries in order
+            
+        Returns:
+            One summary covering the whole group
+        """
+        if len(batch) == 1:
+            return batch[0]
+        return self._generate(*self._merge_request(batch))
+    
+    def _merge_request(self, batch: List[str]) -> Tuple[str, dict]:
+        """
+        Prompt and options for an intermediate reduce
+        
+        Args:
+            batch: Section summaries in order
+            
+        Returns:
+            Tuple of (prompt, options)
+        """
+        combined = "\n\n".join(batch)
+        
+        merge_prompt = f"""Combine these consecutive section summaries into one concise summary, keeping every key point in its original order:
+
+{combined}
+
+Summary:"""
+        
+        options = {
+            "temperature": 0.3,
+            "num_ctx": self.num_ctx,
+            "num_predict": self.map_output_tokens,
+        }
+        return merge_prompt, options
     
     def verify_model_available(self) -> bool:
         """
         Check if the summarization model is available in Ollama
         
+        The model list is cached briefly, so repeated checks don't each
+        query Ollama.
+        
         Returns:
             True if model is available, False otherwise
         """
         try:
-            list_url = f"{OLLAMA_BASE_URL}/api/tags"
-            response = requests.get(list_url, timeout=10)
-            response.raise_for_status()
-            
-            models = response.json().get('models', [])
-            model_names = [m.get('name', '') for m in models]
-            
-            return self.model in model_names or any(self.model in name for name in model_names)
+            return self.client.has_model(self.model)
             
         except Exception as e:
             print(f"Failed to verify model availability: {str(e)}")
             return False
+
+
+class IncrementalSummary:
+    """
+    Map-reduce summary of text that arrives in pieces (e.g. transcript chunks)
+    
+    Once the text is too long for a single request, every completed map
+    chunk is summarized on background threads while more text is still
+    being produced. Only the reduce step waits for the end of the text, so
+    summarizing mostly overlaps transcription. Chunks are identical to those
+    summarize() would use on the complete text.
+    """
+    
+    def __init__(self, summarizer: TextSummarizer):
+        self.summarizer = summarizer
+        self._parts: List[str] = []
+        self._tokens = 0
+        self._chunker = TextChunker(summarizer.map_chunk_tokens, CHUNK_OVERLAP)
+        self._held: List[str] = []  # chunks completed while the text still fit one request
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=OLLAMA_MAX_PARALLEL, thread_name_prefix="summary-map"
+        )
+    
+    def feed(self, text: str) -> None:
+        """
+        Add the next piece of text and start map calls for completed chunks
+        
+        Args:
+            text: Text following everything fed so far
+        """
+        with self._lock:
+            self._parts.append(text)
+            self._tokens += count_tokens(text)
+            if self.summarizer.compressor is not None:
+                return  # Sentences are ranked over the complete text
+            self._held.extend(self._chunker.add(text))
+            if self._tokens > self.summarizer.single_pass_max_tokens:
+                self._submit(self._held)
+                self._held = []
+    
+    def result(self) -> str:
+        """
+        Finish the summary once all text has been fed
+        
+        Returns:
+            Summary text
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        try:
+            summary = self.summarizer._generate(*self._final_request())
+            if not summary:
+                raise Exception("Empty summary received from model")
+            return summary
+            
+        except Exception as e:
+            raise Exception(f"Summarization failed: {str(e)}")
+        finally:
+            self._executor.shutdown(wait=False)
+    
+    def stream(self) -> Iterator[str]:
+        """
+        Finish the summary once all text has been fed, yielding it token by token
+        
+        Yields:
+            Summary text fragments, in order
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        try:
+            yield from self.summarizer._generate_stream(*self._final_request())
+        except Exception as e:
+            raise Exception(f"Summarization failed: {str(e)}")
+        finally:
+            self._executor.shutdown(wait=False)
+    
+    def cancel(self) -> None:
+        """Drop queued map calls (e.g. when transcription failed)"""
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+    
+    def _final_request(self) -> Tuple[str, dict]:
+        """Wait for the map phase and build the single-pass or reduce request"""
+        with self._lock:
+            text = ' '.join(self._parts)
+            direct = (
+                self.summarizer.compressor is not None
+                or self._tokens <= self.summarizer.single_pass_max_tokens
+            )
+            if not direct:
+                self._submit(self._held + self._chunker.finish())
+                self._held = []
+        
+        if direct:
+            # Short text, or compression: nothing was mapped in the background
+            return self.summarizer._final_request(text)
+        
+        print(f"Waiting for {len(self._futures)} section summaries...")
+        chunk_summaries = [future.result() for future in self._futures]
+        return self.summarizer._reduce_request(chunk_summaries)
+    
+    def _submit(self, chunks: List[str]) -> None:
+        """Queue map calls for completed chunks (caller holds the lock)"""
+        for chunk in chunks:
+            print(f"Summarizing chunk {len(self._futures) + 1}...")
+            self._futures.append(self._executor.submit(self.summarizer._summarize_chunk, chunk))
@@ -0,0 +1,153 @@
+"""Process pool for transcribing audio chunks in parallel on CPU cores"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from app.services.audio import duration_seconds
+
+
+# Per-worker state, set once by _init_worker in each child process
+_worker_model = None
+
+
+def _init_worker(model_size: str, device: Optional[str], num_threads: int) -> None:
+    """
+    Initialize a worker process: pin torch thread counts and load the model once
+
+    Args:
+        model_size: Whisper model size to load
+        device: Device to load onto
+        num_threads: Intra-op threads for this worker
+    """
+    global _worker_model
+
+    import torch
+    # Each worker gets its share of the cores so N workers don't each spin
+    # up a full-width thread pool and oversubscribe the machine
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Already initialized in this process
+
+    from app.services.model_registry import model_registry
+    _worker_model = model_registry.get(model_size, device)
+
+
+def _transcribe_chunk(audio: np.ndarray, decode_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Transcribe one chunk with the worker's model
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        decode_options: Keyword arguments for model.transcribe
+
+    Returns:
+        Dict with the chunk's 'text', 'segments' (start, end, text only), and
+        the Whisper time ('elapsed') for 'audio_seconds' of audio
+    """
+    start = time.perf_counter()
+    result = _worker_model.transcribe(audio, **decode_options)
+    elapsed = time.perf_counter() - start
+    segments = [
+        {'start': seg['start'], 'end': seg['end'], 'text': seg['text']}
+        for seg in result.get('segments', [])
+    ]
+    return {
+        'text': result['text'].strip(),
+        'segments': segments,
+        'elapsed': elapsed,
+        'audio_seconds': duration_seconds(audio)
+    }
+
+
+class TranscriptionPool:
+    """Spreads audio chunks over worker processes that each hold one Whisper model"""
+
+    def __init__(self, model_size: str, device: Optional[str], workers: int, threads_per_worker: int = 0):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        # Keep a couple of chunks queued per worker so nobody idles, but don't
+        # pull the whole stream into memory ahead of the workers
+        self.max_pending = workers * 2
+
+        # spawn: torch and forked OpenMP thread pools don't mix well
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, device, self.threads_per_worker)
+        )
+
+    def map(self, windows: Iterable[np.ndarray], decode_options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe windows in parallel, yielding results in input order
+
+        Args:
+            windows: Iterable of 16 kHz mono float32 windows
+            decode_options: Keyword arguments for model.transcribe
+
+        Yields:
+            Result dict ('text', 'segments') for each window, in input order
+        """
+        pending = deque()
+        try:
+            for window in windows:
+                if len(window) == 0:
+                    # Nothing to transcribe (e.g. VAD found no speech)
+                    future = Future()
+                    future.set_result({'text': '', 'segments': []})
+                else:
+                    future = self._executor.submit(_transcribe_chunk, window, decode_options)
+                pending.append(future)
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[Tuple[str, Optional[str], int], TranscriptionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_transcription_pool(
+    model_size: str,
+    device: Optional[str],
+    workers: int,
+    threads_per_worker: int = 0
+) -> TranscriptionPool:
+    """
+    Return the shared pool for a model configuration, starting it on first use
+
+    Workers stay alive between requests so each loads its model only once.
+
+    Args:
+        model_size: Whisper model size
+        device: Device to load onto
+        workers: Number of worker processes
+        threads_per_worker: Torch threads per worker (0 = split cores evenly)
+
+    Returns:
+        Shared TranscriptionPool
+    """
+    key = (model_size, device, workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            print(f"Starting {workers} transcription workers...")
+            pool = TranscriptionPool(model_size, device, workers, threads_per_worker)
+            _pools[key] = pool
+        return pool
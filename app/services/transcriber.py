@@ -1,145 +1,427 @@
 """Audio transcription using offline Whisper model"""
 
-import whisper
+import math
+import time
+import numpy as np
+from collections import deque
 from pathlib import Path
-from typing import List
-from pydub import AudioSegment
-from app.config import CHUNK_DURATION_MINUTES
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+from app.config import (
+    CHUNK_DURATION_MINUTES, WHISPER_MODEL,
+    TRANSCRIBE_WORKERS, TORCH_THREADS_PER_WORKER, PARALLEL_CHUNK_MINUTES, STREAM_WINDOW_SECONDS,
+    VAD_ENABLED, VAD_THRESHOLD_DB, VAD_PADDING_MS, TRANSCRIPT_CACHE_ENABLED
+)
+from app.metrics import record_cache, record_transcription
+from app.models.schemas import TranscriptSegment
+from app.services.audio import SAMPLE_RATE, stream_audio, probe_duration, duration_seconds
+from app.services.cache import hash_file, transcript_cache
+from app.services.model_registry import model_registry
+from app.services.transcribe_pool import get_transcription_pool
+from app.services.vad import SpeechTimeline, detect_speech, extract_speech, split_at_pauses
+
+if TYPE_CHECKING:
+    from app.services.downloader import AudioSource
+
+
+# Tail of the previous chunk's text given to Whisper as the next chunk's
+# prompt, so spelling and context carry across chunk boundaries
+PROMPT_CHARS = 200
 
 
 class AudioTranscriber:
     """Transcribes audio using offline Whisper model"""
     
-    def __init__(self):
-        self.chunk_duration_ms = CHUNK_DURATION_MINUTES * 60 * 1000
-        self.model = None
+    def __init__(
+        self,
+        model_size: Optional[str] = None,
+        device: Optional[str] = None,
+        workers: Optional[int] = None
+    ):
+        # Options: tiny, base, small, medium, large (WHISPER_MODEL, default 'base')
+        self.model_size = model_size or WHISPER_MODEL
+        self.device = device
+        self.workers = workers or TRANSCRIBE_WORKERS
+        
+        # Parallel mode uses shorter chunks so even a 20-minute video keeps
+        # every worker busy
+        chunk_minutes = PARALLEL_CHUNK_MINUTES if self.parallel else CHUNK_DURATION_MINUTES
+        self.chunk_samples = chunk_minutes * 60 * SAMPLE_RATE
+        # While downloading, Whisper works on short windows so it can start
+        # after the first minute of audio instead of after the first chunk
+        self.stream_window_samples = min(self.chunk_samples, STREAM_WINDOW_SECONDS * SAMPLE_RATE)
+        
+    @property
+    def parallel(self) -> bool:
+        """Whether chunks are spread over a process pool"""
+        return self.workers > 1
+        
+    @property
+    def decode_options(self) -> dict:
+        """Keyword arguments passed to Whisper's transcribe()"""
+        return {
+            "fp16": self.fp16,  # fp32 on CPU, fp16 only when configured on GPU
+            "language": "en",  # Auto-detect if None, specify for faster processing
+            "verbose": False,
+        }
+        
+    @property
+    def fp16(self) -> bool:
+        """Whether decoding runs in half precision for the resolved device"""
+        _, _, dtype = model_registry.key_for(self.model_size, self.device)
+        return dtype == "float16"
         
     def _load_model(self):
-        """Lazy load the Whisper model"""
-        if self.model is None:
-            print("Loading Whisper model (this may take a moment on first run)...")
-            # Use 'base' model for good balance of speed and accuracy
-            # Options: tiny, base, small, medium, large
-            self.model = whisper.load_model("base")
-            print("Whisper model loaded successfully!")
-        return self.model
-        
-    def transcribe_audio(
-        self, 
+        """Fetch the shared Whisper model (loaded once per process)"""
+        return model_registry.get(self.model_size, self.device)
+        
+    def cache_options(self, window_samples: int) -> dict:
+        """Settings that change the transcript and therefore the cache key"""
+        options = {k: v for k, v in self.decode_options.items() if k != "verbose"}
+        options["chunk_samples"] = window_samples
+        options["vad"] = [VAD_THRESHOLD_DB, VAD_PADDING_MS] if VAD_ENABLED else None
+        return options
+        
+    def transcribe_with_segments(
+        self,
         audio_file: Path,
         enable_diarization: bool = False,
-        num_speakers: int = None
-    ) -> str:
+        num_speakers: int = None,
+        video_id: Optional[str] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        on_cache_hit: Optional[Callable[[], None]] = None
+    ) -> Tuple[str, List[TranscriptSegment]]:
         """
-        Transcribe audio file to text using offline Whisper
+        Transcribe audio file to text plus timestamped segments
+        
+        Repeat requests for the same audio and settings are served from the
+        transcript cache without decoding or running Whisper.
         
         Args:
             audio_file: Path to audio file
             enable_diarization: Whether to identify speakers
             num_speakers: Expected number of speakers (optional hint)
+            video_id: YouTube video ID, used in the transcript cache key
+            on_text: Called with each chunk's text as soon as it is transcribed
+            on_cache_hit: Called if the transcript came from the cache (so
+                Whisper didn't run)
             
         Returns:
-            Complete transcript text (with speaker labels if diarization enabled)
+            Tuple of (transcript_text, segments). Segment times are absolute
+            seconds from the start of the audio file.
             
         Raises:
             Exception: If transcription fails
         """
         try:
-            # Load the model
-            model = self._load_model()
+            cache_key = None
+            cached = None
+            if TRANSCRIPT_CACHE_ENABLED:
+                cache_key = transcript_cache.key_for(
+                    video_id, hash_file(audio_file), self.model_size,
+                    self.cache_options(self.chunk_samples)
+                )
+                cached = transcript_cache.get_transcript(cache_key)
             
-            # Check if audio needs to be chunked
-            audio = AudioSegment.from_file(audio_file)
-            
-            if len(audio) > self.chunk_duration_ms:
-                transcript = self._transcribe_chunked(audio_file, model)
+            if cached is not None:
+                print("Transcript cache hit, skipping transcription")
+                transcript, segments = cached
+                if on_cache_hit is not None:
+                    on_cache_hit()
+                if on_text is not None:
+                    on_text(transcript)
             else:
-                transcript = self._transcribe_single(audio_file, model)
+                # Load the model (parallel workers hold their own copies)
+                model = None if self.parallel else self._load_model()
+                
+                # Stream fixed-size windows from FFmpeg so peak memory stays bounded
+                # by the window size, no matter how long the video is. Short audio
+                # simply arrives as a single window.
+                duration = probe_duration(audio_file)
+                windows = stream_audio(audio_file, self.chunk_samples)
+                transcript, segments = self._transcribe_chunked(windows, model, duration, on_text)
+                
+                if cache_key is not None:
+                    transcript_cache.set_transcript(cache_key, transcript, segments)
+                    if video_id:
+                        transcript_cache.set_latest(
+                            video_id, self.model_size, self.cache_options(self.chunk_samples), cache_key
+                        )
             
             # Add speaker labels if diarization is enabled
             if enable_diarization:
-                try:
-                    from app.services.diarizer import SpeakerDiarizer
-                    diarizer = SpeakerDiarizer()
-                    segments = diarizer.diarize_audio(audio_file, num_speakers)
-                    if segments:
-                        transcript = diarizer.merge_with_transcript(transcript, segments)
-                except Exception as e:
-                    print(f"Diarization failed, continuing with plain transcript: {e}")
-            
-            return transcript
+                transcript = self._diarize(transcript, audio_file, num_speakers)
+            
+            return transcript, segments
                 
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
     
-    def _transcribe_single(self, audio_file: Path, model) -> str:
+    def cached_transcript(self, video_id: str) -> Optional[Tuple[str, List[TranscriptSegment]]]:
         """
-        Transcribe a single audio file using Whisper
+        Latest cached transcript of a video with the current settings
+        
+        Unlike the lookup in transcribe_with_segments(), this doesn't need the
+        audio, so a repeat request can skip the download as well as Whisper
+        even after the audio has left the audio cache.
         
         Args:
-            audio_file: Path to audio file
-            model: Loaded Whisper model
+            video_id: YouTube video ID
             
         Returns:
-            Transcript text
+            Tuple of (transcript_text, segments), or None if not cached
+        """
+        if not TRANSCRIPT_CACHE_ENABLED:
+            return None
+        # Streamed and downloaded audio are transcribed with different windows
+        cached = None
+        for window_samples in (self.stream_window_samples, self.chunk_samples):
+            cached = transcript_cache.get_latest(
+                video_id, self.model_size, self.cache_options(window_samples)
+            )
+            if cached is not None:
+                break
+        record_cache(transcript_cache.directory.name, hit=cached is not None)
+        return cached
+    
+    def transcribe_source(
+        self,
+        source: "AudioSource",
+        enable_diarization: bool = False,
+        num_speakers: int = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        on_cache_hit: Optional[Callable[[], None]] = None
+    ) -> Tuple[str, List[TranscriptSegment]]:
         """
-        print(f"Transcribing audio file: {audio_file.name}")
+        Transcribe an AudioSource, starting while it is still downloading
         
-        # Transcribe using Whisper (fully offline)
-        result = model.transcribe(
-            str(audio_file),
-            fp16=False,  # Use fp32 for CPU compatibility
-            language='en',  # Auto-detect if None, specify for faster processing
-            verbose=False
-        )
+        Sources already on disk go through transcribe_with_segments() (and the
+        transcript cache). Streaming sources are transcribed window by window
+        as FFmpeg decodes the download, and the result is cached once the
+        download has completed.
         
-        transcript = result['text'].strip()
+        Args:
+            source: AudioSource from YouTubeDownloader.open_audio()
+            enable_diarization: Whether to identify speakers
+            num_speakers: Expected number of speakers (optional hint)
+            on_text: Called with each chunk's text as soon as it is transcribed
+            on_cache_hit: Called if the transcript came from the cache
+            
+        Returns:
+            Tuple of (transcript_text, segments with absolute timestamps)
+            
+        Raises:
+            Exception: If transcription fails
+        """
+        if not source.streaming:
+            return self.transcribe_with_segments(
+                source.audio_file, enable_diarization, num_speakers,
+                source.metadata.video_id, on_text, on_cache_hit
+            )
         
-        if not transcript:
-            raise Exception("Whisper returned empty transcription")
+        try:
+            model = None if self.parallel else self._load_model()
+            windows = source.windows(self.stream_window_samples)
+            transcript, segments = self._transcribe_chunked(
+                windows, model, source.metadata.duration, on_text, self.stream_window_samples
+            )
+            
+            if TRANSCRIPT_CACHE_ENABLED and source.audio_file is not None:
+                cache_key = transcript_cache.key_for(
+                    source.metadata.video_id, hash_file(source.audio_file),
+                    self.model_size, self.cache_options(self.stream_window_samples)
+                )
+                transcript_cache.set_transcript(cache_key, transcript, segments)
+                transcript_cache.set_latest(
+                    source.metadata.video_id, self.model_size,
+                    self.cache_options(self.stream_window_samples), cache_key
+                )
+            
+            if enable_diarization and source.audio_file is not None:
+                transcript = self._diarize(transcript, source.audio_file, num_speakers)
+            
+            return transcript, segments
         
-        print(f"Transcription complete: {len(transcript)} characters")
-        return transcript
+        except Exception as e:
+            raise Exception(f"Transcription failed: {str(e)}")
     
-    def _transcribe_chunked(self, audio_file: Path, model) -> str:
+    def _diarize(self, transcript: str, audio_file: Path, num_speakers: Optional[int]) -> str:
         """
-        Transcribe long audio by splitting into chunks
+        Add speaker labels to a transcript, keeping it unchanged on failure
         
         Args:
+            transcript: Plain transcript text
             audio_file: Path to audio file
+            num_speakers: Expected number of speakers (optional hint)
+            
+        Returns:
+            Transcript with speaker labels, or the plain transcript
+        """
+        try:
+            from app.services.diarizer import SpeakerDiarizer
+            diarizer = SpeakerDiarizer()
+            speaker_segments = diarizer.diarize_audio(audio_file, num_speakers)
+            if speaker_segments:
+                transcript = diarizer.merge_with_transcript(transcript, speaker_segments)
+        except Exception as e:
+            print(f"Diarization failed, continuing with plain transcript: {e}")
+        return transcript
+    
+    def _prepare_window(self, audio: np.ndarray) -> Tuple[np.ndarray, Optional[SpeechTimeline]]:
+        """
+        Strip silence and music from a window before it reaches Whisper
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            
+        Returns:
+            Tuple of (audio_to_transcribe, timeline). The timeline maps times in
+            the returned audio back to the window, or is None when the window
+            is passed through unchanged. Windows without speech come back empty.
+        """
+        if not VAD_ENABLED or len(audio) == 0:
+            return audio, None
+        
+        regions = detect_speech(audio)
+        speech_samples = sum(end - start for start, end in regions)
+        
+        # Concatenating mostly-speech audio saves little and adds cut points
+        if speech_samples >= 0.95 * len(audio):
+            return audio, None
+        
+        compact, timeline = extract_speech(audio, regions)
+        skipped = duration_seconds(audio) - duration_seconds(compact)
+        print(f"VAD: skipping {skipped/60:.1f} of {duration_seconds(audio)/60:.1f} min without speech")
+        return compact, timeline
+    
+    def _transcribe_single(self, audio: np.ndarray, model, prompt: str = "") -> Dict[str, Any]:
+        """
+        Transcribe a decoded PCM buffer using Whisper
+        
+        Args:
+            audio: 16 kHz mono float32 samples
             model: Loaded Whisper model
+            prompt: Text preceding this audio (e.g. the previous chunk's end)
             
         Returns:
-            Combined transcript text
+            Dict with the transcript 'text', Whisper 'segments', and the
+            Whisper time ('elapsed') for 'audio_seconds' of audio
+        """
+        if len(audio) == 0:
+            return {'text': '', 'segments': []}
+        
+        print(f"Transcribing {duration_seconds(audio)/60:.1f} min of audio...")
+        
+        # Transcribe using Whisper (fully offline); passing the array skips
+        # Whisper's own FFmpeg decode
+        start = time.perf_counter()
+        result = model.transcribe(audio, initial_prompt=prompt or None, **self.decode_options)
+        elapsed = time.perf_counter() - start
+        
+        transcript = result['text'].strip()
+        print(f"Transcription complete: {len(transcript)} characters")
+        return {
+            'text': transcript,
+            'segments': result.get('segments', []),
+            'elapsed': elapsed,
+            'audio_seconds': duration_seconds(audio)
+        }
+    
+    def _transcribe_chunked(
+        self,
+        windows: Iterable[np.ndarray],
+        model,
+        duration: Optional[float] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        window_samples: Optional[int] = None
+    ) -> Tuple[str, List[TranscriptSegment]]:
+        """
+        Transcribe long audio window by window
+        
+        Args:
+            windows: Iterable of 16 kHz mono float32 windows streamed from
+                FFmpeg
+            model: Loaded Whisper model (unused in parallel mode)
+            duration: Total duration in seconds, if known (for progress output)
+            on_text: Called with each chunk's text in order, as chunks finish,
+                so consumers (e.g. the summarizer) can start before the end
+            window_samples: Samples per window, if not chunk_samples (for
+                progress output)
+            
+        Returns:
+            Tuple of (combined_transcript, segments with absolute timestamps)
         """
-        audio = AudioSegment.from_file(audio_file)
         transcripts = []
-        num_chunks = (len(audio) + self.chunk_duration_ms - 1) // self.chunk_duration_ms
+        segments = []
+        num_chunks = "?"
+        
+        if duration is not None:
+            num_chunks = max(1, math.ceil(duration * SAMPLE_RATE / (window_samples or self.chunk_samples)))
+            if num_chunks > 1:
+                print(f"Audio is long ({duration/60:.1f} min), processing in {num_chunks} chunks...")
+        
+        # VAD runs in this process; only speech is handed to Whisper. Each
+        # chunk's timeline and start offset are queued in chunk order so
+        # results can be mapped back onto the file's timeline as they arrive.
+        chunk_info = deque()
         
-        print(f"Audio is long ({len(audio)/1000/60:.1f} min), splitting into {num_chunks} chunks...")
+        def prepared():
+            offset = 0.0
+            # Chunk boundaries fall in pauses rather than mid-word
+            for window in split_at_pauses(windows):
+                audio, timeline = self._prepare_window(window)
+                chunk_info.append((timeline, offset))
+                offset += duration_seconds(window)
+                yield audio
         
-        for i in range(0, len(audio), self.chunk_duration_ms):
-            chunk = audio[i:i + self.chunk_duration_ms]
-            chunk_num = i // self.chunk_duration_ms + 1
+        if self.parallel:
+            pool = get_transcription_pool(
+                self.model_size, self.device, self.workers, TORCH_THREADS_PER_WORKER
+            )
+            print(f"Transcribing chunks on {pool.workers} workers ({pool.threads_per_worker} threads each)...")
             
-            print(f"Transcribing chunk {chunk_num}/{num_chunks}...")
+            # Results come back in chunk order regardless of completion order
+            results = pool.map(prepared(), self.decode_options)
+        else:
+            def serial():
+                previous = ""
+                for audio in prepared():
+                    result = self._transcribe_single(audio, model, previous[-PROMPT_CHARS:])
+                    previous = result['text'] or previous
+                    yield result
             
-            # Export chunk to temp file
-            temp_file = audio_file.parent / f"temp_chunk_{chunk_num}.mp3"
-            chunk.export(temp_file, format="mp3")
+            results = serial()
+        
+        for chunk_num, result in enumerate(results, 1):
+            timeline, offset = chunk_info.popleft()
+            if 'elapsed' in result:
+                record_transcription(self.model_size, result['elapsed'], result['audio_seconds'])
+            if timeline is not None:
+                timeline.remap_segments(result['segments'])
+            
+            for seg in result['segments']:
+                text = seg['text'].strip()
+                if text:
+                    segments.append(TranscriptSegment(
+                        start_time=round(seg['start'] + offset, 2),
+                        end_time=round(seg['end'] + offset, 2),
+                        text=text
+                    ))
             
-            try:
-                # Transcribe chunk
-                chunk_transcript = self._transcribe_single(temp_file, model)
-                transcripts.append(chunk_transcript)
-            finally:
-                # Cleanup temp file
-                if temp_file.exists():
-                    temp_file.unlink()
+            if num_chunks != 1:
+                # Cuts at pauses can leave one more chunk than estimated
+                total = num_chunks if num_chunks == "?" else max(num_chunks, chunk_num)
+                print(f"Chunk {chunk_num}/{total} transcribed")
+            if result['text']:
+                transcripts.append(result['text'])
+                if on_text is not None:
+                    on_text(result['text'])
+        
+        if not transcripts:
+            raise Exception("Whisper returned empty transcription")
         
         # Combine all transcripts
         full_transcript = " ".join(transcripts)
-        return full_transcript
+        return full_transcript, segments
     
     def verify_model_available(self) -> bool:
         """
@@ -0,0 +1,270 @@
+"""Voice-activity detection to skip silence and music before Whisper"""
+
+import bisect
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+from app.config import VAD_THRESHOLD_DB, VAD_PADDING_MS
+from app.services.audio import SAMPLE_RATE
+
+
+FRAME_MS = 30
+MIN_SPEECH_MS = 250  # Shorter bursts are clicks/noise
+MIN_SILENCE_MS = 600  # Shorter pauses stay inside one region
+SPEECH_BAND_HZ = (100, 4000)
+MIN_SPEECH_BAND_RATIO = 0.5  # Share of frame power inside the speech band
+MIN_MODULATION_DB = 3.0  # Speech energy rises and falls with syllables; steady music doesn't
+MODULATION_WINDOW_MS = 1000  # Span the modulation is measured over, around each frame
+GAP_SECONDS = 0.2  # Silence inserted between regions so Whisper sees a pause
+FFT_BLOCK_FRAMES = 4096  # Bounds the FFT working set for long windows
+PAUSE_SEARCH_SECONDS = 5.0  # How far back from a window's end to look for a pause
+PAUSE_MS = 300  # Length of the quiet stretch a cut is centered on
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    threshold_db: float = VAD_THRESHOLD_DB,
+    padding_ms: int = VAD_PADDING_MS
+) -> List[Tuple[int, int]]:
+    """
+    Find speech regions using frame energy and spectral features
+
+    A frame counts as speech when it is louder than the adaptive noise floor
+    and most of its power falls in the speech band, and the loudness around
+    it (over MODULATION_WINDOW_MS) varies like syllables do. Frames of
+    sustained music or hum fail that last test even when speech follows
+    them without a pause.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        sample_rate: Sample rate of the buffer
+        threshold_db: dB above the noise floor a frame must reach
+        padding_ms: Context kept on each side of a region
+
+    Returns:
+        Sorted, non-overlapping (start_sample, end_sample) regions
+    """
+    frame_len = int(sample_rate * FRAME_MS / 1000)
+    num_frames = len(audio) // frame_len
+    if num_frames == 0:
+        return []
+
+    # Zero-copy (num_frames, frame_len) view over the buffer
+    frames = audio[:num_frames * frame_len].reshape(num_frames, frame_len)
+
+    energy_db = 10.0 * np.log10(np.mean(np.square(frames), axis=1) + 1e-10)
+    band_ratio = _speech_band_ratio(frames, sample_rate)
+
+    # Adaptive threshold relative to the quietest frames, clamped so that
+    # clearly loud audio always passes and near-digital-silence never does
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = np.clip(noise_floor + threshold_db, -55.0, -35.0)
+    modulation = _rolling_std(energy_db, MODULATION_WINDOW_MS // FRAME_MS)
+    is_speech = (
+        (energy_db > threshold)
+        & (band_ratio > MIN_SPEECH_BAND_RATIO)
+        & (modulation >= MIN_MODULATION_DB)
+    )
+
+    regions = _runs(is_speech)
+    regions = _merge_close(regions, MIN_SILENCE_MS // FRAME_MS)
+
+    min_frames = MIN_SPEECH_MS // FRAME_MS
+    kept = []
+    for start, end in regions:
+        if end - start >= min_frames:
+            kept.append((start, end))
+
+    # Pad in frames, then re-merge regions the padding made overlap
+    pad = padding_ms // FRAME_MS
+    padded = [(max(0, start - pad), min(num_frames, end + pad)) for start, end in kept]
+    padded = _merge_close(padded, 0)
+
+    return [(start * frame_len, min(len(audio), end * frame_len)) for start, end in padded]
+
+
+def extract_speech(
+    audio: np.ndarray,
+    regions: List[Tuple[int, int]],
+    sample_rate: int = SAMPLE_RATE
+) -> Tuple[np.ndarray, "SpeechTimeline"]:
+    """
+    Concatenate speech regions into a compact buffer for transcription
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        regions: Speech regions from detect_speech()
+        sample_rate: Sample rate of the buffer
+
+    Returns:
+        Tuple of (compact_audio, timeline mapping compact times back to the original)
+    """
+    gap = np.zeros(int(GAP_SECONDS * sample_rate), dtype=np.float32)
+    timeline = SpeechTimeline()
+    pieces = []
+    position = 0
+
+    for start, end in regions:
+        if pieces:
+            pieces.append(gap)
+            position += len(gap)
+        timeline.add(position / sample_rate, start / sample_rate, (end - start) / sample_rate)
+        pieces.append(audio[start:end])
+        position += end - start
+
+    compact = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    return compact, timeline
+
+
+def split_at_pauses(
+    windows: Iterable[np.ndarray],
+    sample_rate: int = SAMPLE_RATE,
+    search_seconds: float = PAUSE_SEARCH_SECONDS
+) -> Iterator[np.ndarray]:
+    """
+    Move window boundaries to the quietest point near each cut
+
+    Fixed-size windows cut words in half; each window is instead cut at the
+    quietest PAUSE_MS stretch in its last search_seconds, and the remainder
+    is carried into the next window. Lengths shift by at most search_seconds,
+    and nothing is held back waiting for the next window. A window shorter
+    than the first is taken to be the last and isn't cut.
+
+    Args:
+        windows: Consecutive 16 kHz mono float32 windows
+        sample_rate: Sample rate of the windows
+        search_seconds: How far back from each window's end to search
+
+    Yields:
+        The same audio, re-cut at pauses
+    """
+    frame_len = int(sample_rate * FRAME_MS / 1000)
+    search_frames = int(search_seconds * 1000) // FRAME_MS
+    pause_frames = max(1, PAUSE_MS // FRAME_MS)
+    carry = np.zeros(0, dtype=np.float32)
+    full_size = None
+
+    for window in windows:
+        audio = np.concatenate((carry, window)) if len(carry) else window
+        carry = np.zeros(0, dtype=np.float32)
+        full_size = full_size or len(window)
+        if len(window) < full_size:
+            # Only the last window is short; nothing follows to carry into
+            yield audio
+            continue
+        num_frames = len(audio) // frame_len
+        if num_frames <= 2 * search_frames:
+            # Too short to cut; let it grow with the next window
+            carry = audio
+            continue
+
+        first = num_frames - search_frames
+        frames = audio[first * frame_len:num_frames * frame_len].reshape(-1, frame_len)
+        energy = np.mean(np.square(frames), axis=1)
+        # Quietest stretch, not just the quietest frame
+        smoothed = np.convolve(energy, np.ones(pause_frames), mode='valid')
+        cut = (first + int(np.argmin(smoothed)) + pause_frames // 2) * frame_len
+
+        yield audio[:cut]
+        carry = audio[cut:]
+
+    if len(carry):
+        yield carry
+
+
+class SpeechTimeline:
+    """Maps timestamps in VAD-compacted audio back to the original timeline"""
+
+    def __init__(self):
+        self._compact_starts: List[float] = []
+        self._original_starts: List[float] = []
+        self._lengths: List[float] = []
+
+    def add(self, compact_start: float, original_start: float, length: float) -> None:
+        """Record that a region of length seconds was moved from original_start to compact_start"""
+        self._compact_starts.append(compact_start)
+        self._original_starts.append(original_start)
+        self._lengths.append(length)
+
+    def to_original(self, t: float) -> float:
+        """
+        Convert a time in the compact buffer to the original timeline
+
+        Args:
+            t: Seconds from the start of the compact buffer
+
+        Returns:
+            Seconds from the start of the original audio
+        """
+        if not self._compact_starts:
+            return t
+
+        i = max(0, bisect.bisect_right(self._compact_starts, t) - 1)
+        offset = t - self._compact_starts[i]
+        if offset > self._lengths[i] and i + 1 < len(self._compact_starts):
+            # Inside an inserted gap: snap to the start of the next region
+            return self._original_starts[i + 1]
+        return self._original_starts[i] + min(offset, self._lengths[i])
+
+    def remap_segments(self, segments: List[Dict]) -> List[Dict]:
+        """
+        Rewrite Whisper segment start/end times onto the original timeline
+
+        Args:
+            segments: Whisper result segments with 'start' and 'end' keys
+
+        Returns:
+            The same segments with remapped times
+        """
+        for segment in segments:
+            segment['start'] = self.to_original(segment['start'])
+            segment['end'] = self.to_original(segment['end'])
+        return segments
+
+
+def _speech_band_ratio(frames: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Fraction of each frame's spectral power inside SPEECH_BAND_HZ"""
+    frame_len = frames.shape[1]
+    window = np.hanning(frame_len).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame_len, d=1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+
+    ratio = np.empty(len(frames), dtype=np.float32)
+    for start in range(0, len(frames), FFT_BLOCK_FRAMES):
+        block = frames[start:start + FFT_BLOCK_FRAMES] * window
+        power = np.square(np.abs(np.fft.rfft(block, axis=1)))
+        ratio[start:start + len(block)] = power[:, band].sum(axis=1) / (power.sum(axis=1) + 1e-10)
+    return ratio
+
+
+def _rolling_std(values: np.ndarray, width: int) -> np.ndarray:
+    """Standard deviation over a centered window of `width` values (shrinking at the edges)"""
+    values = values.astype(np.float64)
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    squares = np.concatenate(([0.0], np.cumsum(values ** 2)))
+    index = np.arange(len(values))
+    lo = np.maximum(index - width // 2, 0)
+    hi = np.minimum(index + width // 2 + 1, len(values))
+    count = hi - lo
+    mean = (sums[hi] - sums[lo]) / count
+    variance = (squares[hi] - squares[lo]) / count - mean ** 2
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Return (start, end) index pairs of consecutive True runs in a boolean mask"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _merge_close(regions: List[Tuple[int, int]], max_gap: int) -> List[Tuple[int, int]]:
+    """Merge regions separated by at most max_gap frames"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in regions:
+        if merged and start - merged[-1][1] <= max_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
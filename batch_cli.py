@@ -0,0 +1,65 @@
+"""Command-line batch summarization of videos, playlists and channels"""
+
+import argparse
+import contextlib
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import BATCH_DOWNLOAD_WORKERS, BATCH_STT_WORKERS, BATCH_LLM_WORKERS
+from app.services.batch import BatchRunner
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Summarize YouTube videos, playlists or channels; writes one JSON result per line"
+    )
+    parser.add_argument("urls", nargs="*", help="Video, playlist or channel URLs")
+    parser.add_argument("-f", "--file", help="Text file with one URL per line")
+    parser.add_argument("-o", "--output", help="Write NDJSON here instead of stdout")
+    parser.add_argument("--mode", choices=["abstractive", "extractive"], default="abstractive")
+    parser.add_argument("--download-workers", type=int, default=BATCH_DOWNLOAD_WORKERS)
+    parser.add_argument("--stt-workers", type=int, default=BATCH_STT_WORKERS)
+    parser.add_argument("--llm-workers", type=int, default=BATCH_LLM_WORKERS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    urls = list(args.urls)
+    if args.file:
+        lines = Path(args.file).read_text(encoding="utf-8").splitlines()
+        urls += [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    if not urls:
+        print("No URLs given", file=sys.stderr)
+        return 1
+
+    runner = BatchRunner(
+        download_workers=args.download_workers,
+        stt_workers=args.stt_workers,
+        llm_workers=args.llm_workers
+    )
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    # Progress logs go to stderr so stdout carries nothing but NDJSON
+    with contextlib.redirect_stdout(sys.stderr):
+        videos = runner.expand(urls)
+        try:
+            for item in runner.run(videos, args.mode):
+                output.write(item.model_dump_json() + "\n")
+                output.flush()
+                if item.status == "failed":
+                    failed += 1
+        finally:
+            # sys.stdout is stderr in here; close only a file we opened
+            if args.output:
+                output.close()
+
+    print(f"✅ {len(videos) - failed}/{len(videos)} videos summarized", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,11 @@ from pathlib import Path
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.services.downloader import YouTubeDownloader
 from app.services.transcriber import AudioTranscriber
 from app.services.summarizer import TextSummarizer
-from app.config import SUMMARIZATION_MODEL
+from app.services.model_registry import model_registry
+from app.services.pipeline import SummarizationPipeline
+from app.config import SUMMARIZATION_MODEL, WHISPER_PRELOAD
 
 
 def check_models():
@@ -24,34 +25,9 @@ def check_models():
     return stt_ok, sum_ok
 
 
-def process_video(url, enable_diarization, num_speakers, progress=gr.Progress()):
-    """Process YouTube video and return results"""
-    if not url:
-        return None, None, "⚠️ Please enter a YouTube URL"
-    
-    try:
-        downloader = YouTubeDownloader()
-        transcriber = AudioTranscriber()
-        summarizer = TextSummarizer()
-        
-        # Progress updates
-        progress(0.1, desc="📥 Downloading audio...")
-        audio_file, metadata = downloader.download_audio(url)
-        
-        progress(0.3, desc="🎤 Transcribing audio..." + (" & identifying speakers" if enable_diarization else ""))
-        transcript = transcriber.transcribe_audio(
-            audio_file,
-            enable_diarization=enable_diarization,
-            num_speakers=num_speakers if enable_diarization else None
-        )
-        
-        progress(0.6, desc="📝 Generating summary...")
-        summary = summarizer.summarize(transcript)
-        
-        progress(1.0, desc="✅ Complete!")
-        
-        # Format metadata
-        info = f"""
+def format_info(metadata):
+    """Format video metadata as Markdown"""
+    return f"""
 ## 📺 Video Information
 
 **Title:** {metadata.title}  
@@ -59,12 +35,45 @@ def process_video(url, enable_diarization, num_speakers, progress=gr.Progress())
 **Duration:** {metadata.duration // 60} minutes  
 **Video ID:** {metadata.video_id}
 """
+
+
+def process_video(url, enable_diarization, num_speakers, extractive_only, progress=gr.Progress()):
+    """Process YouTube video, streaming results as each stage produces them"""
+    if not url:
+        yield None, None, "⚠️ Please enter a YouTube URL"
+        return
+    
+    try:
+        pipeline = SummarizationPipeline()
+        info = transcript = summary = None
         
-        return summary, transcript, info
+        # Transcription starts while the audio downloads, and the summary
+        # appears token by token
+        for event, data in pipeline.stream(
+            url,
+            enable_diarization=enable_diarization,
+            num_speakers=num_speakers if enable_diarization else None,
+            mode="extractive" if extractive_only else "abstractive"
+        ):
+            if event == "queued":
+                progress(0.0, desc=f"⏳ Waiting for a worker (~{data / 60:.0f} min)...")
+            elif event == "progress":
+                progress(data[0], desc=data[1])
+            elif event == "metadata":
+                info = format_info(data)
+                yield summary, transcript, info
+            elif event == "transcript":
+                transcript = data[0]
+                yield summary, transcript, info
+            elif event == "token":
+                summary = (summary or "") + data
+                yield summary, transcript, info
+            elif event == "result":
+                yield data.summary, data.transcript, info
         
     except Exception as e:
         error_msg = f"❌ Error: {str(e)}"
-        return None, None, error_msg
+        yield None, None, error_msg
 
 
 # Custom CSS for minimal, clean design
@@ -182,6 +191,12 @@ with gr.Blocks(title="YTSumAI - YouTube Summarizer") as app:
                     inputs=[enable_diarization],
                     outputs=[num_speakers]
                 )
+                
+                extractive_only = gr.Checkbox(
+                    label="⚡ Quick Extractive Summary",
+                    value=False,
+                    info="Key sentences from the transcript, no LLM (instant, for triage)"
+                )
             
             submit_btn = gr.Button(
                 "✨ SUMMARIZE",
@@ -226,12 +241,16 @@ with gr.Blocks(title="YTSumAI - YouTube Summarizer") as app:
     # Event handlers
     submit_btn.click(
         fn=process_video,
-        inputs=[url_input, enable_diarization, num_speakers],
+        inputs=[url_input, enable_diarization, num_speakers, extractive_only],
         outputs=[summary_output, transcript_output, info_output]
     )
 
 
 if __name__ == "__main__":
+    # Load Whisper once up front; every click reuses the shared model
+    if WHISPER_PRELOAD:
+        model_registry.preload()
+    
     app.launch(
         server_name="0.0.0.0",
         server_port=7860,
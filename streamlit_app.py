@@ -1,15 +1,15 @@
 """Streamlit UI for YTSumAI - Offline YouTube Video Summarizer"""
 
 import streamlit as st
-import time
 from pathlib import Path
 import sys
 
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.services import YouTubeDownloader, AudioTranscriber, TextSummarizer
-from app.config import SUMMARIZATION_MODEL
+from app.services import AudioTranscriber, TextSummarizer, model_registry
+from app.services.pipeline import SummarizationPipeline
+from app.config import SUMMARIZATION_MODEL, WHISPER_MODEL, WHISPER_PRELOAD
 from app.models.schemas import VideoMetadata
 
 
@@ -313,6 +313,11 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Pre-warm the shared Whisper model; the registry lives for the whole server
+# process, so script reruns and new sessions reuse the same weights
+if WHISPER_PRELOAD:
+    model_registry.preload()
+
 # Initialize session state
 if 'processing' not in st.session_state:
     st.session_state.processing = False
@@ -331,61 +336,54 @@ def check_ollama_models():
     return stt_available, sum_available
 
 
-def process_video(url: str, enable_diarization: bool = False, num_speakers: int = None):
+def process_video(
+    url: str,
+    enable_diarization: bool = False,
+    num_speakers: int = None,
+    mode: str = "abstractive"
+):
     """Process YouTube video: download, transcribe, summarize"""
     
-    downloader = YouTubeDownloader()
-    transcriber = AudioTranscriber()
-    summarizer = TextSummarizer()
+    pipeline = SummarizationPipeline()
     
     progress_bar = st.progress(0)
     status_text = st.empty()
+    summary_preview = st.empty()
     
     try:
-        start_time = time.time()
-        
-        # Step 1: Download audio
-        status_text.text("📥 Downloading audio from YouTube...")
-        progress_bar.progress(10)
-        audio_file, metadata = downloader.download_audio(url)
-        progress_bar.progress(30)
-        
-        # Step 2: Transcribe audio (with optional diarization)
-        if enable_diarization:
-            status_text.text("🎤 Transcribing audio and identifying speakers...")
-        else:
-            status_text.text("🎤 Transcribing audio to text...")
-        transcript = transcriber.transcribe_audio(audio_file, enable_diarization, num_speakers)
-        progress_bar.progress(60)
-        
-        # Step 3: Summarize transcript
-        status_text.text("📝 Generating summary...")
-        summary = summarizer.summarize(transcript)
-        progress_bar.progress(90)
-        
-        # Note: Audio file kept for verification (cleaned up on next download)
-        progress_bar.progress(100)
-        
-        processing_time = time.time() - start_time
-        
-        # Calculate word counts
-        transcript_word_count = len(transcript.split())
-        summary_word_count = len(summary.split())
+        # Download, transcribe (overlapped with the download) and summarize,
+        # showing the summary as the LLM writes it
+        result = None
+        summary = ""
+        for event, data in pipeline.stream(url, enable_diarization, num_speakers, mode):
+            if event == "queued":
+                status_text.text(f"⏳ Waiting for a worker (~{data / 60:.0f} min)...")
+            elif event == "progress":
+                fraction, message = data
+                status_text.text(message)
+                progress_bar.progress(int(fraction * 100))
+            elif event == "token":
+                summary += data
+                summary_preview.markdown(summary)
+            elif event == "result":
+                result = data
         
+        summary_preview.empty()
         status_text.text("✅ Processing complete!")
         
         return {
-            'metadata': metadata,
-            'transcript': transcript,
-            'summary': summary,
-            'processing_time': processing_time,
-            'transcript_word_count': transcript_word_count,
-            'summary_word_count': summary_word_count
+            'metadata': result.metadata,
+            'transcript': result.transcript,
+            'summary': result.summary,
+            'processing_time': result.processing_time,
+            'transcript_word_count': result.transcript_word_count,
+            'summary_word_count': result.summary_word_count
         }
         
     except Exception as e:
         status_text.text("")
         progress_bar.empty()
+        summary_preview.empty()
         raise e
 
 
@@ -399,7 +397,7 @@ st.markdown("<br>", unsafe_allow_html=True)
 with st.sidebar:
     st.header("⚙️ Configuration")
     st.markdown(f"""
-    **STT Model:** OpenAI Whisper (offline)  
+    **STT Model:** OpenAI Whisper `{WHISPER_MODEL}` (offline)  
     **Summarization:** `{SUMMARIZATION_MODEL}` (Ollama)
     """)
     
@@ -468,6 +466,12 @@ with st.expander("⚙️ Advanced Options", expanded=False):
         )
     else:
         num_speakers = None
+    
+    extractive_only = st.checkbox(
+        " ⚡ Quick Extractive Summary",
+        value=False,
+        help="Key sentences from the transcript, no LLM call (instant, for triage)"
+    )
         
     # Show estimated processing time
     if enable_diarization:
@@ -482,7 +486,8 @@ if submit_button and url:
     else:
         try:
             with st.spinner("Processing video..."):
-                result = process_video(url, enable_diarization, num_speakers)
+                mode = "extractive" if extractive_only else "abstractive"
+                result = process_video(url, enable_diarization, num_speakers, mode)
                 st.session_state.result = result
             
             st.success("✅ Video processed successfully!")